@@ -1,36 +1,19 @@
 import os
+import threading
 from flask import Flask, jsonify
 from flask_cors import CORS
-from flasgger import Swagger
 from flask_jwt_extended import JWTManager
 from flask_pymongo import PyMongo
 
+from app.utils.profiler import profiler
+from app.utils.startup import profile
+
 mongo = PyMongo()
 jwt = JWTManager()
 
-def create_app():
-    app = Flask(__name__)
-
-    # --- Config ---
-    app.config["SECRET_KEY"] = os.getenv("SECRET_KEY", "supersecretkey")
-    app.config["JWT_SECRET_KEY"] = os.getenv("JWT_SECRET_KEY", "jwtsecretkey")
-    app.config["MONGO_URI"] = os.getenv("MONGO_URI", "mongodb://localhost:27017/mine_detector_db")
-
-    mongo.init_app(app)
-    jwt.init_app(app)
-
-    # --- ✅ Single CORS setup ---
-    CORS(
-        app,
-        resources={r"/api/*": {"origins": [
-            "http://localhost:8080",
-            "http://127.0.0.1:8080",
-            "https://intellimine.vercel.app"
-        ]}},
-        supports_credentials=True
-    )
-
-    # --- Swagger setup ---
+def _init_swagger(app):
+    # flasgger (and its jsonschema/yaml stack) is only imported when docs are enabled
+    from flasgger import Swagger
     Swagger(app, template={
         "swagger": "2.0",
         "info": {
@@ -40,16 +23,79 @@ def create_app():
         },
     })
 
-    from app.routes.auth_routes import auth_bp
-    from app.routes.predict_routes import bp as predict_bp
+def create_app():
+    app = Flask(__name__)
 
-    app.register_blueprint(auth_bp, url_prefix="/api/auth")
-    app.register_blueprint(predict_bp, url_prefix="/api")
+    # --- Config ---
+    app.config["SECRET_KEY"] = os.getenv("SECRET_KEY", "supersecretkey")
+    app.config["JWT_SECRET_KEY"] = os.getenv("JWT_SECRET_KEY", "jwtsecretkey")
+    app.config["MONGO_URI"] = os.getenv("MONGO_URI", "mongodb://localhost:27017/mine_detector_db")
+
+    with profile.stage("init:extensions"):
+        mongo.init_app(app)
+        jwt.init_app(app)
+        profiler.init_app(app)
+
+        # --- ✅ Single CORS setup ---
+        CORS(
+            app,
+            resources={r"/api/*": {"origins": [
+                "http://localhost:8080",
+                "http://127.0.0.1:8080",
+                "https://intellimine.vercel.app"
+            ]}},
+            supports_credentials=True
+        )
+
+    # --- Swagger setup (ENABLE_SWAGGER=0 skips it entirely) ---
+    if os.getenv("ENABLE_SWAGGER", "1") == "1":
+        with profile.stage("import:flasgger+swagger"):
+            _init_swagger(app)
+
+    with profile.stage("import:blueprints"):
+        from app.routes.auth_routes import auth_bp
+        from app.routes.predict_routes import bp as predict_bp, warm_up
+        from app.routes.gpr_routes import gpr_bp
+        from app.routes.risk_routes import risk_bp
+        from app.routes.simulation_routes import sim_bp
+        from app.routes.profiling_routes import profiling_bp
+        from app.routes.monitoring_routes import monitor_bp
+
+        app.register_blueprint(auth_bp, url_prefix="/api/auth")
+        app.register_blueprint(predict_bp, url_prefix="/api")
+        app.register_blueprint(gpr_bp, url_prefix="/api")
+        app.register_blueprint(risk_bp, url_prefix="/api")
+        app.register_blueprint(sim_bp, url_prefix="/api")
+        app.register_blueprint(profiling_bp, url_prefix="/api")
+        app.register_blueprint(monitor_bp, url_prefix="/api")
+
+    # --- Model warm-up ---
+    # eager: load + dummy inference before serving (gunicorn preload, see gunicorn.conf.py)
+    # background: start serving immediately, warm up on a thread (default)
+    # lazy: load on the first request that needs a model
+    warmup_mode = os.getenv("WARMUP_MODE", "background")
+    if warmup_mode == "eager":
+        warm_up()
+    elif warmup_mode == "background":
+        threading.Thread(target=warm_up, name="model-warmup", daemon=True).start()
+    else:
+        profile.ready.set()
 
     @app.route("/")
     def home():
         return jsonify({"message": "✅ IntelliMine API running", "status": "ok"})
 
+    @app.route("/ready")
+    def ready():
+        # readiness probe: 503 until the models are loaded and warmed up
+        if profile.ready.is_set():
+            return jsonify({"status": "ready"}), 200
+        return jsonify({"status": "warming_up"}), 503
+
+    @app.route("/startup-profile")
+    def startup_profile():
+        return jsonify(profile.report()), 200
+
     return app
 
 if __name__ == "__main__":
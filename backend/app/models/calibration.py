@@ -1,149 +1,314 @@
 # backend/app/models/calibration.py
 """
 Train a RandomForest baseline + IsotonicRegression calibration model
-using the uploaded dataset at /mnt/data/mine_detection_dataset.csv.
+out of core, so the sensor log can be much larger than RAM.
 
-Outputs (saved in backend/app/models/):
+    python calibration.py [--data mine_detection_dataset.csv] [--chunksize 200000]
+
+Pass 1 streams the CSV in chunks with explicit float32/int8 dtypes and grows
+the forest with warm_start: every chunk adds a batch of trees fitted on that
+chunk's training rows. Pass 2 streams it again, scoring the calibration and
+test rows. Each row is assigned to train / calibration / test by a seeded
+per-chunk draw, so the split is reproducible and nothing has to be held in
+memory. Isotonic regression is fitted on a fine histogram of calibration-split
+probabilities (weighted bin means), never on the rows the metrics come from.
+
+Outputs (saved in backend/app/models/, or --out-dir):
  - calibration_model.pkl      (IsotonicRegression)
  - rf_baseline.pkl            (RandomForestClassifier baseline)
- - calibration_metadata.json  (metrics + simple summary)
+ - calibration_metadata.json  (metrics, split sizes, peak memory, wall time)
 """
 
-import os
+import argparse
 import json
+import math
+import time
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.isotonic import IsotonicRegression
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import brier_score_loss, roc_auc_score, log_loss
-from sklearn.calibration import calibration_curve
 import joblib
 
-# === CONFIG ===
-DATA_PATH = "mine_detection_dataset.csv"   # uploaded dataset
-OUT_DIR = Path(__file__).resolve().parent  # backend/app/models
-OUT_DIR.mkdir(parents=True, exist_ok=True)
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
 
-RF_PATH = OUT_DIR / "rf_baseline.pkl"
-CALIB_PATH = OUT_DIR / "calibration_model.pkl"
-META_PATH = OUT_DIR / "calibration_metadata.json"
+# === CONFIG ===
+MODELS_DIR = Path(__file__).resolve().parent  # backend/app/models
+DATA_PATH = MODELS_DIR / "mine_detection_dataset.csv"
 
 RANDOM_STATE = 42
-TEST_SIZE = 0.25
-
-# === LOAD ===
-print("Loading dataset:", DATA_PATH)
-df = pd.read_csv(DATA_PATH)
-print("Columns:", df.columns.tolist())
-# Try to guess label column: prefer 'Mine_Present' or 'mine_present' or 'M' or last column
-possible_labels = ["Mine_Present", "mine_present", "MinePresent", "M", "mine", "label"]
-label_col = None
-for name in possible_labels:
-    if name in df.columns:
-        label_col = name
-        break
-# fallback to last column
-if label_col is None:
-    label_col = df.columns[-1]
-
-print("Using label column:", label_col)
-
-# features = everything except label
-X = df.drop(columns=[label_col])
-y = df[label_col].astype(int)  # ensure integer 0/1
-
-# basic checks
-unique_labels = sorted(y.unique().tolist())
-print("Unique labels in target:", unique_labels)
-if not set(unique_labels).issubset({0, 1}):
-    print("WARNING: labels are not binary 0/1. Attempting to map values >0 to 1.")
-    y = (y > 0).astype(int)
-
-# split
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=TEST_SIZE, random_state=RANDOM_STATE, stratify=y
-)
-
-print(f"Train samples: {len(X_train)}, Test samples: {len(X_test)}")
-
-# === TRAIN BASELINE RANDOM FOREST ===
-rf = RandomForestClassifier(
-    n_estimators=200,
-    max_depth=12,
-    random_state=RANDOM_STATE,
-    n_jobs=-1
-)
-print("Training RandomForest baseline...")
-rf.fit(X_train, y_train)
-joblib.dump(rf, RF_PATH)
-print("Saved RF baseline to:", RF_PATH)
-
-# === RAW PROBABILITIES ON HOLDOUT ===
-print("Predicting raw probabilities on holdout...")
-raw_probs = rf.predict_proba(X_test)[:, 1]  # probability for class 1
-raw_preds = rf.predict(X_test)
-
-# basic raw metrics
-brier_raw = float(brier_score_loss(y_test, raw_probs))
-auc_raw = float(roc_auc_score(y_test, raw_probs)) if len(np.unique(y_test)) > 1 else None
-logloss_raw = float(log_loss(y_test, raw_probs)) if len(np.unique(y_test)) > 1 else None
-print("Raw Brier:", brier_raw, "AUC:", auc_raw)
-
-# === FIT ISOTONIC REGRESSION ON raw_probs -> y_test ===
-print("Fitting Isotonic Regression for calibration...")
-iso = IsotonicRegression(out_of_bounds="clip")
-# Isotonic expects 1D arrays of shape (n_samples,)
-iso.fit(raw_probs, y_test)
-joblib.dump(iso, CALIB_PATH)
-print("Saved calibration model to:", CALIB_PATH)
-
-# calibrated probs
-cal_probs = iso.predict(raw_probs)
-
-# calibrated metrics
-brier_cal = float(brier_score_loss(y_test, cal_probs))
-auc_cal = float(roc_auc_score(y_test, cal_probs)) if len(np.unique(y_test)) > 1 else None
-logloss_cal = float(log_loss(y_test, cal_probs)) if len(np.unique(y_test)) > 1 else None
-print("Calibrated Brier:", brier_cal, "AUC:", auc_cal)
-
-# calibration curve (reliability diagram buckets)
-fraction_of_pos, mean_predicted_value = calibration_curve(y_test, cal_probs, n_bins=10)
-
-meta = {
-    "dataset": str(DATA_PATH),
-    "n_samples": int(len(df)),
-    "train_samples": int(len(X_train)),
-    "test_samples": int(len(X_test)),
-    "rf": {
-        "n_estimators": rf.n_estimators,
-        "max_depth": rf.max_depth
-    },
-    "metrics": {
-        "raw": {
-            "brier": brier_raw,
-            "auc": auc_raw,
-            "logloss": logloss_raw
+CALIB_FRACTION = 0.15
+TEST_FRACTION = 0.15
+N_ESTIMATORS = 200          # total trees, spread over the chunks
+MAX_DEPTH = 12
+CHUNKSIZE = 200_000
+BINS = 2000                 # probability histogram resolution for calibration/metrics
+EPS = 1e-15
+
+TRAIN, CALIB, TEST = 0, 1, 2
+POSSIBLE_LABELS = ["Mine_Present", "mine_present", "MinePresent", "M", "mine", "label"]
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    # ru_maxrss is KiB on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0, 1)
+
+
+def inspect_columns(path):
+    """Header-only read: (feature columns, label column, dtype map)."""
+    columns = pd.read_csv(path, nrows=0).columns.tolist()
+    label_col = next((c for c in POSSIBLE_LABELS if c in columns), columns[-1])
+    features = [c for c in columns if c != label_col]
+    dtypes = {c: np.float32 for c in features}
+    dtypes[label_col] = np.float32   # cast to 0/1 int8 after reading; tolerates 0.0/1.0 and >1 codes
+    return features, label_col, dtypes
+
+
+def count_rows(path, block=1 << 24):
+    n = 0
+    with open(path, "rb") as f:
+        while buf := f.read(block):
+            n += buf.count(b"\n")
+    return max(0, n - 1)  # header
+
+
+def iter_chunks(path, features, label_col, dtypes, chunksize):
+    """Yield (chunk index, X float32, y int8, split codes) per chunk."""
+    reader = pd.read_csv(path, usecols=features + [label_col], dtype=dtypes, chunksize=chunksize)
+    for i, df in enumerate(reader):
+        X = df[features].to_numpy(dtype=np.float32)
+        y = (df[label_col].to_numpy() > 0).astype(np.int8)
+        draw = np.random.default_rng([RANDOM_STATE, i]).random(len(df))
+        split = np.full(len(df), TRAIN, dtype=np.int8)
+        split[draw < CALIB_FRACTION + TEST_FRACTION] = CALIB
+        split[draw < TEST_FRACTION] = TEST
+        yield i, X, y, split
+
+
+def train_forest(path, features, label_col, dtypes, chunksize, n_chunks):
+    trees_per_chunk = max(1, math.ceil(N_ESTIMATORS / n_chunks))
+    rf = RandomForestClassifier(
+        n_estimators=0,
+        max_depth=MAX_DEPTH,
+        random_state=RANDOM_STATE,
+        n_jobs=-1,
+        warm_start=True,
+    )
+    n_train = 0
+
+    def fit(i, Xt, yt):
+        nonlocal n_train
+        rf.n_estimators += trees_per_chunk
+        rf.fit(Xt, yt)
+        n_train += len(yt)
+        print(f"  chunk {i}: +{trees_per_chunk} trees on {len(yt)} rows "
+              f"(total {rf.n_estimators}, peak RSS {peak_rss_mb()} MB)")
+
+    pending_X, pending_y = [], []
+    # each two-class batch is fitted once the next one is ready, so single-class
+    # rows at the end of the file can still join the last batch
+    held = None
+    for i, X, y, split in iter_chunks(path, features, label_col, dtypes, chunksize):
+        pending_X.append(X[split == TRAIN])
+        pending_y.append(y[split == TRAIN])
+        Xt, yt = np.concatenate(pending_X), np.concatenate(pending_y)
+        # warm_start re-derives classes_ from each fit, so a batch must contain both labels
+        if len(np.unique(yt)) < 2:
+            continue
+        pending_X, pending_y = [], []
+        if held is not None:
+            fit(*held)
+        held = (i, Xt, yt)
+    if held is None:
+        raise ValueError("Training split never contained both classes")
+    i, Xt, yt = held
+    if pending_X:
+        Xt, yt = np.concatenate([Xt, *pending_X]), np.concatenate([yt, *pending_y])
+    fit(i, Xt, yt)
+    return rf, n_train
+
+
+class StreamingBinaryMetrics:
+    """Brier / log loss accumulated exactly, plus per-class probability histograms for AUC and curves."""
+
+    def __init__(self, bins=BINS):
+        self.bins = bins
+        self.pos = np.zeros(bins)
+        self.neg = np.zeros(bins)
+        self.prob_sum = np.zeros(bins)
+        self.brier = 0.0
+        self.logloss = 0.0
+        self.n = 0
+
+    def update(self, p, y):
+        p = p.astype(np.float64)
+        b = np.minimum((p * self.bins).astype(np.int64), self.bins - 1)
+        self.pos += np.bincount(b, weights=y, minlength=self.bins)
+        self.neg += np.bincount(b, weights=1 - y, minlength=self.bins)
+        self.prob_sum += np.bincount(b, weights=p, minlength=self.bins)
+        self.brier += float(((p - y) ** 2).sum())
+        pc = np.clip(p, EPS, 1 - EPS)
+        self.logloss -= float((y * np.log(pc) + (1 - y) * np.log(1 - pc)).sum())
+        self.n += len(p)
+
+    def bin_means(self):
+        """(mean probability, count, positives) of the non-empty bins."""
+        count = self.pos + self.neg
+        nz = count > 0
+        return self.prob_sum[nz] / count[nz], count[nz], self.pos[nz]
+
+    def auc(self):
+        P, N = self.pos.sum(), self.neg.sum()
+        if P == 0 or N == 0:
+            return None
+        # Mann-Whitney over bins; ties within a bin count one half
+        neg_below = np.cumsum(self.neg) - self.neg
+        return float((self.pos * (neg_below + 0.5 * self.neg)).sum() / (P * N))
+
+    def summary(self):
+        return {
+            "brier": self.brier / self.n,
+            "auc": self.auc(),
+            "logloss": self.logloss / self.n,
+        }
+
+
+def calibrated_metrics(raw, iso, n_bins=10):
+    """Apply iso to the test histogram (each bin at its mean raw probability)."""
+    mean_p, count, pos = raw.bin_means()
+    cal = np.clip(iso.predict(mean_p), 0.0, 1.0)
+    neg = count - pos
+    pc = np.clip(cal, EPS, 1 - EPS)
+    n = count.sum()
+    brier = float((pos * (1 - cal) ** 2 + neg * cal ** 2).sum() / n)
+    logloss = float(-(pos * np.log(pc) + neg * np.log(1 - pc)).sum() / n)
+
+    # AUC over calibrated scores: merge bins that isotonic maps to the same value
+    order = np.argsort(cal, kind="stable")
+    levels, inverse = np.unique(cal[order], return_inverse=True)
+    lvl_pos = np.bincount(inverse, weights=pos[order])
+    lvl_neg = np.bincount(inverse, weights=neg[order])
+    P, N = lvl_pos.sum(), lvl_neg.sum()
+    auc = None
+    if P > 0 and N > 0:
+        auc = float((lvl_pos * (np.cumsum(lvl_neg) - lvl_neg + 0.5 * lvl_neg)).sum() / (P * N))
+
+    # reliability curve, same bucketing as sklearn.calibration.calibration_curve (uniform)
+    bucket = np.minimum((cal * n_bins).astype(np.int64), n_bins - 1)
+    b_count = np.bincount(bucket, weights=count, minlength=n_bins)
+    b_pos = np.bincount(bucket, weights=pos, minlength=n_bins)
+    b_prob = np.bincount(bucket, weights=cal * count, minlength=n_bins)
+    nz = b_count > 0
+    curve = {
+        "fraction_of_pos": (b_pos[nz] / b_count[nz]).tolist(),
+        "mean_predicted_value": (b_prob[nz] / b_count[nz]).tolist(),
+    }
+    return {"brier": brier, "auc": auc, "logloss": logloss}, curve
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Out-of-core RF + isotonic calibration training")
+    parser.add_argument("--data", default=str(DATA_PATH))
+    parser.add_argument("--chunksize", type=int, default=CHUNKSIZE)
+    parser.add_argument("--out-dir", default=str(MODELS_DIR))
+    args = parser.parse_args()
+
+    out_dir = Path(args.out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rf_path = out_dir / "rf_baseline.pkl"
+    calib_path = out_dir / "calibration_model.pkl"
+    meta_path = out_dir / "calibration_metadata.json"
+    timings = {}
+
+    # === INSPECT ===
+    t0 = time.perf_counter()
+    print("Dataset:", args.data)
+    features, label_col, dtypes = inspect_columns(args.data)
+    n_rows = count_rows(args.data)
+    n_chunks = max(1, math.ceil(n_rows / args.chunksize))
+    print(f"Features: {features}, label: {label_col}, rows: {n_rows}, chunks: {n_chunks}")
+    timings["scan_s"] = round(time.perf_counter() - t0, 2)
+
+    # === PASS 1: GROW FOREST ===
+    t0 = time.perf_counter()
+    print("Training RandomForest baseline (warm start across chunks)...")
+    rf, n_train = train_forest(args.data, features, label_col, dtypes, args.chunksize, n_chunks)
+    joblib.dump(rf, rf_path)
+    print("Saved RF baseline to:", rf_path)
+    timings["train_s"] = round(time.perf_counter() - t0, 2)
+
+    # === PASS 2: SCORE CALIBRATION + TEST SPLITS ===
+    t0 = time.perf_counter()
+    print("Scoring calibration and test splits...")
+    calib = StreamingBinaryMetrics()
+    test = StreamingBinaryMetrics()
+    for _, X, y, split in iter_chunks(args.data, features, label_col, dtypes, args.chunksize):
+        keep = split != TRAIN
+        if not keep.any():
+            continue
+        p = rf.predict_proba(X[keep])[:, 1]
+        s, yk = split[keep], y[keep].astype(np.float64)
+        calib.update(p[s == CALIB], yk[s == CALIB])
+        test.update(p[s == TEST], yk[s == TEST])
+    timings["score_s"] = round(time.perf_counter() - t0, 2)
+    if calib.n == 0 or test.n == 0:
+        raise ValueError("Calibration or test split is empty; dataset too small")
+
+    # === FIT ISOTONIC ON CALIBRATION SPLIT ===
+    t0 = time.perf_counter()
+    print("Fitting Isotonic Regression on the calibration split...")
+    mean_p, count, pos = calib.bin_means()
+    iso = IsotonicRegression(out_of_bounds="clip")
+    iso.fit(mean_p, pos / count, sample_weight=count)
+    joblib.dump(iso, calib_path)
+    print("Saved calibration model to:", calib_path)
+    timings["calibrate_s"] = round(time.perf_counter() - t0, 3)
+
+    raw_metrics = test.summary()
+    cal_metrics, curve = calibrated_metrics(test, iso)
+    print("Raw Brier:", raw_metrics["brier"], "AUC:", raw_metrics["auc"])
+    print("Calibrated Brier:", cal_metrics["brier"], "AUC:", cal_metrics["auc"])
+
+    timings["total_s"] = round(sum(timings.values()), 2)
+    meta = {
+        "dataset": Path(args.data).name,
+        "n_samples": int(n_rows),
+        "train_samples": int(n_train),
+        "calibration_samples": int(calib.n),
+        "test_samples": int(test.n),
+        "rf": {
+            "n_estimators": rf.n_estimators,
+            "max_depth": rf.max_depth
         },
-        "calibrated": {
-            "brier": brier_cal,
-            "auc": auc_cal,
-            "logloss": logloss_cal
+        "training": {
+            "chunksize": args.chunksize,
+            "chunks": n_chunks,
+            "histogram_bins": BINS,
+            "peak_rss_mb": peak_rss_mb(),
+            "wall_time": timings
         },
-        "improvement": {
-            "brier_delta": brier_raw - brier_cal
-        }
-    },
-    "reliability_curve": {
-        "fraction_of_pos": fraction_of_pos.tolist(),
-        "mean_predicted_value": mean_predicted_value.tolist()
+        "metrics": {
+            "raw": raw_metrics,
+            "calibrated": cal_metrics,
+            "improvement": {
+                "brier_delta": raw_metrics["brier"] - cal_metrics["brier"]
+            }
+        },
+        "reliability_curve": curve
     }
-}
 
-with open(META_PATH, "w") as f:
-    json.dump(meta, f, indent=2)
+    with open(meta_path, "w") as f:
+        json.dump(meta, f, indent=2)
+
+    print("Saved calibration metadata to:", meta_path)
+    print(f"Done in {timings['total_s']}s, peak RSS {meta['training']['peak_rss_mb']} MB.")
+
 
-print("Saved calibration metadata to:", META_PATH)
-print("Done. You can now copy calibration_model.pkl into your backend models folder (it was saved there).")
+if __name__ == "__main__":
+    main()
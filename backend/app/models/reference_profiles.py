@@ -0,0 +1,45 @@
+# backend/app/models/reference_profiles.py
+"""
+Export the training-data reference profiles used by the live drift monitor
+(app/utils/drift.py, GET /api/monitor/drift).
+
+    python reference_profiles.py
+
+Outputs (saved in backend/app/models/):
+ - mine_reference_profile.json     (FEATURES order of /predict/mine, from mine_detection_dataset.csv)
+ - tabular_reference_profile.json  (V, H, S of /predict/mine-type, from processed_dataset.csv)
+
+train_tabular_model.py rewrites the tabular profile from its own training split.
+"""
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+MODELS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(MODELS_DIR.parents[1]))  # backend/
+
+from app.utils.drift import build_reference, save_reference  # noqa: E402
+from app.utils.features import FEATURES, RAW_CHANNELS, derive_features  # noqa: E402
+
+TABULAR_FEATURES = ["V", "H", "S"]
+
+MINE_REFERENCE_PATH = MODELS_DIR / "mine_reference_profile.json"
+TABULAR_REFERENCE_PATH = MODELS_DIR / "tabular_reference_profile.json"
+
+
+def export_mine_profile(csv_path=MODELS_DIR / "mine_detection_dataset.csv", out=MINE_REFERENCE_PATH):
+    raw = pd.read_csv(csv_path, usecols=RAW_CHANNELS)[RAW_CHANNELS].to_numpy(dtype=float)
+    save_reference(build_reference(derive_features(raw), FEATURES), out)
+    print("Saved mine reference profile to:", out)
+
+
+def export_tabular_profile(X, out=TABULAR_REFERENCE_PATH):
+    save_reference(build_reference(X, TABULAR_FEATURES), out)
+    print("Saved tabular reference profile to:", out)
+
+
+if __name__ == "__main__":
+    export_mine_profile()
+    df = pd.read_csv(MODELS_DIR / "processed_dataset.csv")
+    export_tabular_profile(df[TABULAR_FEATURES].to_numpy(dtype=float))
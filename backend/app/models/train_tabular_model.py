@@ -138,7 +138,16 @@ print("Saved xgb_tabular_model.pkl")
 
 
 # ======================================================
-# 9. DONE
+# 9. DRIFT REFERENCE PROFILE
+# ======================================================
+
+# live V/H/S inputs to /predict/mine-type are compared against this
+from reference_profiles import export_tabular_profile
+export_tabular_profile(X_train.to_numpy(dtype=float))
+
+
+# ======================================================
+# 10. DONE
 # ======================================================
 
 print("\nTraining complete. Models + dataset saved successfully!")
@@ -0,0 +1,199 @@
+# backend/app/routes/gpr_routes.py
+from flask import Blueprint, request, jsonify, current_app, Response
+from functools import lru_cache
+import logging
+import os
+import re
+import time
+import uuid
+
+from app.utils.gpr import decode_bscan, analyze_bscan, detrend
+from gpr_tiles import build_tile_pyramid, TilePyramid, encode_png_gray
+
+gpr_bp = Blueprint("gpr_bp", __name__)
+
+# 64 MB is ~16M float32 samples, far above any single B-scan we record
+MAX_BSCAN_BYTES = 64 * 1024 * 1024
+SCAN_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+# pyramids are up to ~21 MB each; only the newest ones are kept on disk
+MAX_TILE_SCANS = int(os.getenv("GPR_MAX_TILE_SCANS", "20"))
+
+
+def _tile_dir():
+    path = os.getenv("GPR_TILE_DIR") or os.path.join(current_app.instance_path, "gpr_tiles")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _prune_tiles(tile_dir, keep=MAX_TILE_SCANS):
+    # oldest pyramids first; a deleted scan answers 404 like any unknown scan_id
+    entries = [e for e in os.scandir(tile_dir) if e.name.endswith(".tiles") and e.is_file()]
+    entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+    for e in entries[keep:]:
+        try:
+            os.remove(e.path)
+        except OSError as err:
+            logging.warning(f"Could not remove old GPR tiles {e.path}: {err}")
+
+
+@lru_cache(maxsize=32)
+def _open_pyramid(path):
+    # pyramids are immutable once written, so the memory map can be shared across requests
+    return TilePyramid(path)
+
+
+@gpr_bp.route("/gpr/analyze", methods=["POST"])
+def analyze():
+    """
+    Detect buried point targets in a GPR B-scan.
+    ---
+    tags:
+      - GPR
+    consumes:
+      - application/octet-stream
+    parameters:
+      - name: body
+        in: body
+        required: true
+        description: .npy file, or raw little-endian float32 (traces x samples, row-major)
+      - name: traces
+        in: query
+        type: integer
+        description: number of traces (raw float32 uploads only)
+      - name: samples
+        in: query
+        type: integer
+        description: samples per trace (raw float32 uploads only)
+      - name: depth_per_sample
+        in: query
+        type: number
+        description: metres per depth sample, used to report depth_m
+      - name: sample_interval
+        in: query
+        type: number
+        description: sampling interval used for the spectrum frequency axis
+      - name: min_score
+        in: query
+        type: number
+      - name: max_targets
+        in: query
+        type: integer
+    responses:
+      200:
+        description: Candidate targets with depth and score, depth-energy curve and spectrum
+      400:
+        description: Invalid upload
+      500:
+        description: Server error
+    """
+    try:
+        if request.content_length and request.content_length > MAX_BSCAN_BYTES:
+            return jsonify({"error": f"B-scan larger than {MAX_BSCAN_BYTES} bytes."}), 413
+        args = request.args
+        try:
+            data = decode_bscan(request.get_data(cache=False), args.get("traces"), args.get("samples"))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        t0 = time.perf_counter()
+        result = analyze_bscan(
+            data,
+            min_score=float(args.get("min_score", 5.0)),
+            max_targets=int(args.get("max_targets", 20)),
+            sample_interval=float(args.get("sample_interval", 1.0)),
+            depth_per_sample=float(args["depth_per_sample"]) if "depth_per_sample" in args else None,
+        )
+        result["elapsed_ms"] = round((time.perf_counter() - t0) * 1000.0, 1)
+
+        logging.info(f"GPR analyze shape={result['shape']} targets={len(result['targets'])} took={result['elapsed_ms']}ms")
+        return jsonify(result), 200
+    except Exception as e:
+        logging.error(f"GPR analysis error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+@gpr_bp.route("/gpr/tiles", methods=["POST"])
+def create_tiles():
+    """
+    Build a multi-resolution heatmap tile pyramid for a B-scan.
+    ---
+    tags:
+      - GPR
+    consumes:
+      - application/octet-stream
+    parameters:
+      - name: body
+        in: body
+        required: true
+        description: .npy file, or raw little-endian float32 (traces x samples, row-major)
+      - name: traces
+        in: query
+        type: integer
+      - name: samples
+        in: query
+        type: integer
+    responses:
+      201:
+        description: scan_id and pyramid layout (tile size, zoom levels, level sizes); only the newest GPR_MAX_TILE_SCANS (default 20) pyramids are kept
+      400:
+        description: Invalid upload
+    """
+    try:
+        if request.content_length and request.content_length > MAX_BSCAN_BYTES:
+            return jsonify({"error": f"B-scan larger than {MAX_BSCAN_BYTES} bytes."}), 413
+        try:
+            data = decode_bscan(request.get_data(cache=False), request.args.get("traces"), request.args.get("samples"))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        scan_id = uuid.uuid4().hex
+        tile_dir = _tile_dir()
+        meta = build_tile_pyramid(detrend(data), os.path.join(tile_dir, f"{scan_id}.tiles"))
+        _prune_tiles(tile_dir)
+        response = {
+            "scan_id": scan_id,
+            "tile_size": meta["tile_size"],
+            "max_zoom": meta["max_zoom"],
+            "vmin": meta["vmin"],
+            "vmax": meta["vmax"],
+            "levels": [
+                {"zoom": e["zoom"], "width": e["width"], "height": e["height"],
+                 "tiles_x": -(-e["width"] // meta["tile_size"]),
+                 "tiles_y": -(-e["height"] // meta["tile_size"])}
+                for e in meta["levels"]
+            ],
+        }
+        logging.info(f"GPR tiles scan_id={scan_id} shape={list(data.shape)} zooms={meta['max_zoom'] + 1}")
+        return jsonify(response), 201
+    except Exception as e:
+        logging.error(f"GPR tiling error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+@gpr_bp.route("/gpr/tiles/<scan_id>/<int:z>/<int:x>/<int:y>.png", methods=["GET"])
+def get_tile(scan_id, z, x, y):
+    """
+    Fetch one 8-bit greyscale heatmap tile (x along traces, y down in depth).
+    ---
+    tags:
+      - GPR
+    produces:
+      - image/png
+    responses:
+      200:
+        description: PNG tile
+      404:
+        description: Unknown scan or tile outside the pyramid
+    """
+    if not SCAN_ID_RE.match(scan_id):
+        return jsonify({"error": "Unknown scan."}), 404
+    path = os.path.join(_tile_dir(), f"{scan_id}.tiles")
+    if not os.path.exists(path):
+        return jsonify({"error": "Unknown scan."}), 404
+    try:
+        tile = _open_pyramid(path).tile(z, x, y)
+    except IndexError as e:
+        return jsonify({"error": str(e)}), 404
+    resp = Response(encode_png_gray(tile), mimetype="image/png")
+    resp.headers["Cache-Control"] = "public, max-age=86400, immutable"
+    return resp
@@ -0,0 +1,55 @@
+# backend/app/routes/monitoring_routes.py
+from flask import Blueprint, request, jsonify
+import logging
+
+from app.routes.predict_routes import DRIFT_REFERENCES, get_drift_monitor
+from app.utils.profiler import profiler
+
+monitor_bp = Blueprint("monitor_bp", __name__)
+
+
+@monitor_bp.route("/monitor/drift", methods=["GET"])
+def drift_report():
+    """
+    Live input drift of /predict/mine (FEATURES) and /predict/mine-type (V, H, S) inputs.
+    ---
+    tags:
+      - Monitoring
+    responses:
+      200:
+        description: Per model status (stable / moderate / drift), drift score (worst-feature PSI) and per-feature stats
+    """
+    report = {}
+    for name in DRIFT_REFERENCES:
+        monitor = get_drift_monitor(name)
+        report[name] = monitor.report() if monitor is not None else {"status": "no_reference_profile"}
+    return jsonify(report), 200
+
+
+@monitor_bp.route("/monitor/drift/reset", methods=["POST"])
+def reset_drift():
+    """
+    Clear the live statistics, e.g. after recalibrating a sensor. Admin only (PROFILER_TOKEN).
+    ---
+    tags:
+      - Monitoring
+    parameters:
+      - name: X-Profile-Token
+        in: header
+        type: string
+        required: true
+    responses:
+      200:
+        description: Statistics cleared
+      404:
+        description: Missing or wrong admin token
+    """
+    # same admin check as /admin/profiling; wiping drift evidence would hide sensor faults
+    if not profiler.is_admin(request):
+        return jsonify({"error": "Not found"}), 404
+    for name in DRIFT_REFERENCES:
+        monitor = get_drift_monitor(name)
+        if monitor is not None:
+            monitor.reset()
+    logging.info("Drift statistics reset")
+    return jsonify({"message": "Drift statistics reset"}), 200
@@ -1,9 +1,19 @@
 # backend/app/routes/predict_routes.py
-from flask import Blueprint, request, jsonify
-import joblib, numpy as np, os, logging
-from heapq import heappush, heappop
-import math
+from flask import Blueprint, request, jsonify, Response
+import numpy as np, os, logging
 import random
+import threading
+import time
+
+from app.utils.drift import DriftMonitor
+from app.utils.encoding import encode_cost_map, encode_path
+from app.utils.features import FEATURES, RAW_CHANNELS, prepare_features
+from app.utils.frames import (FrameError, decode_frames, decode_msgpack_frames, encode_results,
+                              encode_msgpack_results, MSGPACK_TYPES, OCTET_TYPE, msgpack)
+from app.utils.path_planning import (a_star, build_cost_map, coverage_path, obstacle_cost, random_mines,
+                                     AnytimePlanner, refine_in_background, get_plan)
+from app.routes.risk_routes import mission_grid
+from app.utils.startup import profile
 
 bp = Blueprint("predict_bp", __name__)
 
@@ -18,33 +28,75 @@ logging.basicConfig(
 BASE = os.path.dirname(os.path.abspath(__file__))
 PIPE_PATH = os.path.join(BASE, "..", "models", "mine_detector_pipeline.pkl")
 
-# Load pipeline model (existing)
-try:
-    pipeline = joblib.load(PIPE_PATH)
-    logging.info("✅ Model loaded successfully.")
-except Exception as e:
-    pipeline = None
-    logging.error(f"❌ Failed to load model: {e}")
-
-# Feature order (existing)
-FEATURES = [
-    'Metal_Level', 'Magnetic_Field', 'Ground_Density', 'Thermal_Signature',
-    'Metal_Mag_Ratio', 'Metal_Diff', 'Metal_Mag_Energy', 'Metal_Mag_Avg'
-]
-
-# Tabular model paths & load (existing) ...
+# Upper bound on rows in one JSON /predict/mine batch (binary frames go to /ingest/frames)
+MAX_JSON_ROWS = 10000
+
+# Tabular model paths (existing) ...
 TABULAR_DIR = os.path.join(BASE, "..", "models")
 SCALER_PATH = os.path.join(TABULAR_DIR, "scaler.pkl")
 MODEL_PATH = os.path.join(TABULAR_DIR, "rf_tabular_model.pkl")
 
-try:
-    tab_scaler = joblib.load(SCALER_PATH)
-    tab_model = joblib.load(MODEL_PATH)
-    logging.info("✅ Tabular model + scaler loaded successfully.")
-except Exception as e:
-    tab_scaler = None
-    tab_model = None
-    logging.error(f"❌ Failed to load tabular model: {e}")
+# Training-data profiles for input drift monitoring (models/reference_profiles.py)
+DRIFT_REFERENCES = {
+    "mine": os.path.join(TABULAR_DIR, "mine_reference_profile.json"),
+    "mine_type": os.path.join(TABULAR_DIR, "tabular_reference_profile.json"),
+}
+
+# Models are loaded on first use (or by warm_up) so importing this module
+# does not pull in joblib/sklearn; each load is attempted once.
+_models = {}
+_models_lock = threading.Lock()
+
+def _load_once(name, loader):
+    if name not in _models:
+        with _models_lock:
+            if name not in _models:
+                try:
+                    with profile.stage(f"load:{name}"):
+                        _models[name] = loader()
+                    logging.info(f"✅ {name} loaded successfully.")
+                except Exception as e:
+                    _models[name] = None
+                    logging.error(f"❌ Failed to load {name}: {e}")
+    return _models[name]
+
+def get_pipeline():
+    import joblib
+    return _load_once("pipeline", lambda: joblib.load(PIPE_PATH))
+
+def get_tabular():
+    """(scaler, model) for /predict/mine-type, or (None, None)."""
+    import joblib
+    pair = _load_once("tabular", lambda: (joblib.load(SCALER_PATH), joblib.load(MODEL_PATH)))
+    return pair if pair is not None else (None, None)
+
+def get_drift_monitor(name):
+    """DriftMonitor for 'mine' or 'mine_type', or None without a reference profile."""
+    return _load_once(f"drift:{name}", lambda: DriftMonitor.from_file(DRIFT_REFERENCES[name]))
+
+def warm_up():
+    """Import the model stack, load every model and run one dummy inference."""
+    try:
+        # hold the model lock so a request arriving mid-import waits instead of
+        # unpickling against half-initialised sklearn modules
+        with _models_lock:
+            with profile.stage("import:joblib"):
+                import joblib  # noqa: F401
+            with profile.stage("import:sklearn+imblearn"):
+                import sklearn.ensemble, imblearn.pipeline  # noqa: F401
+        pipe = get_pipeline()
+        tab_scaler, tab_model = get_tabular()
+        for name in DRIFT_REFERENCES:
+            get_drift_monitor(name)
+        with profile.stage("warmup:inference"):
+            if pipe is not None:
+                pipe.predict_proba(np.zeros((1, len(FEATURES))))
+            if tab_model is not None:
+                tab_model.predict_proba(tab_scaler.transform(np.zeros((1, 3))))
+    except Exception as e:
+        logging.error(f"Warm-up failed: {e}")
+    finally:
+        profile.ready.set()
 
 MINE_LABELS = {
     1: "Null",
@@ -80,31 +132,114 @@ def severity_from(probability: float, mine_weight: float) -> dict:
         level = "CRITICAL"; color = "#ef4444"
     return {"score": score, "level": level, "color": color}
 
+def score_batch(X):
+    """One predict_proba call for a whole (n, len(FEATURES)) batch -> (pred, proba of class 1)."""
+    pipeline = get_pipeline()
+    proba = pipeline.predict_proba(X)
+    monitor = get_drift_monitor("mine")
+    if monitor is not None:
+        monitor.observe(X)
+    pred = pipeline.classes_[np.argmax(proba, axis=1)]
+    return pred.astype(np.int64), proba[:, 1]
+
 # --- Existing endpoints (predict_mine, predict_mine_type) ---
+def _parse_flag(value):
+    # JSON booleans plus the usual string/0-1 spellings; bool("false") would be True
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str) and value.strip().lower() in ("1", "true", "yes", "0", "false", "no", ""):
+        return value.strip().lower() in ("1", "true", "yes")
+    raise ValueError(f"expected true or false, got {value!r}")
+
+
+def _mine_result(pred, proba):
+    mine_weight = 0.8 if pred == 1 else 0.1
+    sev = severity_from(proba, mine_weight)
+    return {
+        "prediction": pred,
+        "probability": round(proba, 3),
+        "message": "⚠️ Mine detected!" if pred == 1 else "✅ No mine detected.",
+        "severity_score": sev["score"],
+        "severity_level": sev["level"],
+        "severity_color": sev["color"]
+    }
+
 @bp.route("/predict/mine", methods=["POST"])
 def predict_mine():
+    """
+    Mine / no-mine prediction for one reading or a batch.
+    ---
+    tags:
+      - Prediction
+    parameters:
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: object
+          properties:
+            input:
+              type: array
+              description: >
+                One row or a list of rows, each either the 4 raw channels
+                (Metal_Level, Magnetic_Field, Ground_Density, Thermal_Signature)
+                or all 8 FEATURES; derived columns are computed server-side for raw rows.
+              example: [0.65, 0.22, 0.45, 0.33]
+            mission_id: {type: string}
+            position: {type: array, description: "[x, y] cell, or one per row for a batch; required with mission_id"}
+    responses:
+      200:
+        description: Prediction for a single row, or {"rows", "results"} for a batch
+      400:
+        description: Wrong number of values, or missing/mismatched position with mission_id
+      404:
+        description: Unknown mission_id
+    """
     try:
+        pipeline = get_pipeline()
         if pipeline is None:
             return jsonify({"error": "Model not loaded on server."}), 500
         data = request.get_json(force=True)
         arr = data.get("input")
-        if not arr or len(arr) != len(FEATURES):
-            return jsonify({"error": f"Expected {len(FEATURES)} numeric values in order: {FEATURES}"}), 400
-        sample = np.array(arr, dtype=float).reshape(1, -1)
-        pred = int(pipeline.predict(sample)[0])
-        proba = float(pipeline.predict_proba(sample)[0, 1])
-        mine_weight = 0.8 if pred == 1 else 0.1
-        sev = severity_from(proba, mine_weight)
-        result = {
-            "prediction": pred,
-            "probability": round(proba, 3),
-            "message": "⚠️ Mine detected!" if pred == 1 else "✅ No mine detected.",
-            "severity_score": sev["score"],
-            "severity_level": sev["level"],
-            "severity_color": sev["color"]
-        }
-        logging.info(f"Input: {arr} → {result}")
-        return jsonify(result), 200
+        if not arr:
+            return jsonify({"error": f"Expected {len(RAW_CHANNELS)} raw values {RAW_CHANNELS} "
+                                     f"or {len(FEATURES)} values in order: {FEATURES}"}), 400
+        batch = isinstance(arr[0], (list, tuple))
+        if batch and len(arr) > MAX_JSON_ROWS:
+            return jsonify({"error": f"At most {MAX_JSON_ROWS} rows per request."}), 400
+        try:
+            X = prepare_features(arr)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        # geotagged readings also feed the mission risk grid
+        pos = risk = None
+        if data.get("mission_id"):
+            try:
+                pos = np.asarray(data.get("position"), dtype=float)
+                pos = pos.reshape(-1, 2) if batch else pos[:2].reshape(1, 2)
+            except (TypeError, ValueError, IndexError):
+                pos = None
+            if pos is None or len(pos) != len(X) or not np.isfinite(pos).all():
+                return jsonify({"error": "With mission_id, position must be [x, y] "
+                                         "(a batch needs one [x, y] per row)."}), 400
+            risk = mission_grid(data["mission_id"])
+            if risk is None:
+                return jsonify({"error": f"Unknown mission: {data['mission_id']}"}), 404
+
+        preds, probas = score_batch(X)
+        results = [_mine_result(int(p), float(q)) for p, q in zip(preds, probas)]
+
+        if risk is not None:
+            risk.update(pos[:, 0], pos[:, 1], probas)
+
+        if batch:
+            logging.info(f"Batch input: {len(results)} rows, {int(preds.sum())} mines")
+            return jsonify({"rows": len(results), "results": results}), 200
+        logging.info(f"Input: {arr} → {results[0]}")
+        return jsonify(results[0]), 200
     except Exception as e:
         logging.error(f"Error during prediction: {e}")
         return jsonify({"error": str(e)}), 500
@@ -112,6 +247,7 @@ def predict_mine():
 @bp.route("/predict/mine-type", methods=["POST"])
 def predict_mine_type():
     try:
+        tab_scaler, tab_model = get_tabular()
         if tab_model is None:
             return jsonify({"error": "Tabular model not loaded."}), 500
         data = request.get_json(force=True)
@@ -120,6 +256,9 @@ def predict_mine_type():
         V = float(data["V"]); H = float(data["H"]); S = int(data["S"])
         sample = np.array([[V, H, S]], dtype=float)
         sample_scaled = tab_scaler.transform(sample)
+        monitor = get_drift_monitor("mine_type")
+        if monitor is not None:
+            monitor.observe(sample)
         pred_class = int(tab_model.predict(sample_scaled)[0])
         try:
             proba = float(tab_model.predict_proba(sample_scaled)[0][pred_class - 1])
@@ -144,53 +283,66 @@ def predict_mine_type():
         logging.error(f"Tabular prediction error: {e}")
         return jsonify({"error": str(e)}), 500
 
-# --- NEW: Safe Path Generator Endpoint ---
-def heuristic(a, b):
-    # Euclidean heuristic
-    return math.hypot(b[0] - a[0], b[1] - a[1])
-
-def neighbors(node, max_x, max_y):
-    # 8-connected
-    x, y = node
-    for dx in (-1, 0, 1):
-        for dy in (-1, 0, 1):
-            if dx == 0 and dy == 0:
-                continue
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < max_x and 0 <= ny < max_y:
-                yield (nx, ny)
-
-def a_star(grid_cost, start, goal):
-    max_x = len(grid_cost)
-    max_y = len(grid_cost[0])
-    open_set = []
-    heappush(open_set, (0 + heuristic(start, goal), 0, start, None))
-    came_from = {}
-    gscore = {start: 0}
-
-    while open_set:
-        f, g, current, _ = heappop(open_set)
-        if current == goal:
-            # reconstruct path
-            path = []
-            node = current
-            while node:
-                path.append(node)
-                node = came_from.get(node)
-            path.reverse()
-            return path
-        for nb in neighbors(current, max_x, max_y):
-            # movement cost = grid_cost at neighbor * movement distance (sqrt2 if diagonal)
-            step_cost = grid_cost[nb[0]][nb[1]]
-            move_cost = math.hypot(nb[0] - current[0], nb[1] - current[1])
-            tentative_g = g + (step_cost * move_cost)
-            if tentative_g < gscore.get(nb, float("inf")):
-                came_from[nb] = current
-                gscore[nb] = tentative_g
-                fscore = tentative_g + heuristic(nb, goal)
-                heappush(open_set, (fscore, tentative_g, nb, current))
-    return None  # no path
+# Upper bound on one ingestion request (~1M rows of 8 float32 features)
+MAX_FRAME_BYTES = 32 * 1024 * 1024
 
+@bp.route("/ingest/frames", methods=["POST"])
+def ingest_frames():
+    """
+    Score packed binary sensor frames (see app/utils/frames.py for the layout).
+    ---
+    consumes:
+      - application/octet-stream
+      - application/msgpack
+    produces:
+      - application/json
+      - application/octet-stream
+      - application/msgpack
+    parameters:
+      - name: body
+        in: body
+        required: true
+        description: 12-byte IMF1 header + rows x cols little-endian float32, or a msgpack map
+    responses:
+      200:
+        description: Probabilities and predictions (JSON, IMR1 binary or msgpack per Accept header)
+      400:
+        description: Malformed frame
+      500:
+        description: Server error
+    """
+    try:
+        if get_pipeline() is None:
+            return jsonify({"error": "Model not loaded on server."}), 500
+        if request.content_length and request.content_length > MAX_FRAME_BYTES:
+            return jsonify({"error": f"Frame batch larger than {MAX_FRAME_BYTES} bytes."}), 413
+        body = request.get_data(cache=False)
+        try:
+            if request.mimetype in MSGPACK_TYPES:
+                layout, X = decode_msgpack_frames(body)
+            else:
+                layout, X = decode_frames(body)
+        except FrameError as e:
+            return jsonify({"error": str(e)}), 400
+
+        pred, proba = score_batch(prepare_features(X))
+
+        # JSON unless the client explicitly prefers a binary response
+        best = request.accept_mimetypes.best_match(["application/json", OCTET_TYPE, *MSGPACK_TYPES])
+        if best in MSGPACK_TYPES and msgpack is not None:
+            return Response(encode_msgpack_results(pred, proba), mimetype=MSGPACK_TYPES[0])
+        if best == OCTET_TYPE:
+            return Response(encode_results(pred, proba), mimetype=OCTET_TYPE)
+        return jsonify({
+            "rows": int(len(pred)),
+            "prediction": pred.tolist(),
+            "probability": np.round(proba, 3).tolist(),
+        }), 200
+    except Exception as e:
+        logging.error(f"Frame ingestion error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+# --- NEW: Safe Path Generator Endpoint ---
 @bp.route("/path/generate", methods=["POST"])
 def generate_path():
     """
@@ -201,16 +353,28 @@ def generate_path():
       "start": [x,y],
       "goal": [x,y],
       "mines": [ {"x":10,"y":12,"radius":2,"severity":0.9}, ... ]  // optional
+      "mission_id": "alpha",  // optional: plan on that mission's risk grid instead of mines
       "obstacle_threshold": 0.7  // severity threshold to treat as solid obstacle
+      "mode": "point",  // or "coverage": boustrophedon sweep of the whole field from start
+      "lane_spacing": 1,  // coverage mode: cells between sweep lanes (sensor footprint width)
+      "time_budget_ms": 50,  // optional (point mode): anytime ARA* search, deadline counted from request arrival
+      "initial_inflation": 3.0,  // anytime: starting heuristic inflation
+      "compact": false,  // optional: encoded cost map + path (see app/utils/encoding.py)
+      "max_cost_side": 256  // optional: cost map downsampling limit when compact
     }
     Response:
     {
       "grid_size": [w,h],
       "danger_zones": [ {x,y,radius,severity}, ... ],
-      "path": [[x,y],...],
-      "grid_cost_sample": [[...],...]  // a small sample or encoding — optional
+      "path": [[x,y],...],  // replaced by "path_encoded" when compact
+      "grid_cost_sample": null  // uint8/base64 cost map with scale + offset when compact
+      // coverage mode also returns: "coverage_percent", "path_length", "cells"
+      // anytime mode also returns: "path_cost", "suboptimality_bound", "optimal",
+      //   and "plan_id" + "refining" while it keeps improving (poll /path/plan/<plan_id>);
+      //   "path" is [] when the first pass missed the budget; the plan follows via plan_id
     }
     """
+    received = time.perf_counter()
     try:
         payload = request.get_json(force=True)
         W = int(payload.get("width", 40))
@@ -219,57 +383,73 @@ def generate_path():
         goal = tuple(payload.get("goal", [W-1, H-1]))
         mines = payload.get("mines", None)
         obstacle_threshold = float(payload.get("obstacle_threshold", 0.75))
+        try:
+            compact = _parse_flag(payload.get("compact", False))
+        except ValueError as e:
+            return jsonify({"error": f"compact: {e}"}), 400
+        try:
+            max_cost_side = int(payload.get("max_cost_side", 256))
+        except (TypeError, ValueError):
+            max_cost_side = 0
+        if max_cost_side < 1:
+            return jsonify({"error": "max_cost_side must be a positive integer"}), 400
+        mode = payload.get("mode", "point")
+        lane_spacing = max(1, int(payload.get("lane_spacing", 1)))
+        time_budget_ms = payload.get("time_budget_ms")
+        time_budget_ms = max(1.0, float(time_budget_ms)) if time_budget_ms is not None else None
+        if mode not in ("point", "coverage"):
+            return jsonify({"error": "mode must be 'point' or 'coverage'"}), 400
+
+        # A mission risk grid is used directly as the cost map (no mine list needed)
+        mission_id = payload.get("mission_id")
+        risk = mission_grid(mission_id) if mission_id else None
+        if mission_id and risk is None:
+            return jsonify({"error": f"Unknown mission: {mission_id}"}), 404
+        if risk is not None:
+            W, H = risk.width, risk.height
+            goal = tuple(payload.get("goal", [W-1, H-1]))
 
         # If no mines passed, generate sample random mine points for demo
-        if not mines:
-            random.seed(42)
-            mines = []
-            for _ in range(6):
-                mx = random.randint(2, W-3)
-                my = random.randint(2, H-3)
-                severity = round(random.uniform(0.4, 1.0), 2)
-                radius = random.randint(1, 3)
-                mines.append({"x": mx, "y": my, "radius": radius, "severity": severity})
-
-        # Build grid cost map: base cost 1.0, add large cost near mines
-        grid_cost = [[1.0 for _ in range(H)] for _ in range(W)]
-
-        danger_zones = []
-        for m in mines:
-            mx = int(m.get("x"))
-            my = int(m.get("y"))
-            radius = int(m.get("radius", 2))
-            severity = float(m.get("severity", 0.8))
-            danger_zones.append({"x": mx, "y": my, "radius": radius, "severity": severity})
-            # for each cell in radius, increase cost by severity-scaled factor
-            for i in range(max(0, mx - radius - 1), min(W, mx + radius + 1)):
-                for j in range(max(0, my - radius - 1), min(H, my + radius + 1)):
-                    dist = math.hypot(i - mx, j - my)
-                    if dist <= radius + 0.5:
-                        # cost increases quickly near the core
-                        add_cost = 1.0 + (severity * (1 + (radius - dist)))
-                        grid_cost[i][j] += add_cost
-
-        # Convert to 2D list with [x][y] indexing as above
-        # If severity >= threshold mark cell as obstacle by setting huge cost
-        for i in range(W):
-            for j in range(H):
-                if grid_cost[i][j] > (1.0 + obstacle_threshold * 5.0):
-                    # treat as very expensive but allow path to go if no alternative
-                    grid_cost[i][j] = grid_cost[i][j] * 10.0
+        if not mines and risk is None:
+            mines = random_mines(W, H, random.Random(42))
+
+        # Build grid cost map: base cost 1.0, add large cost near mines,
+        # cells above the obstacle threshold become very expensive (x10)
+        if risk is not None:
+            grid_cost, danger_zones = risk.cost_map(obstacle_threshold), []
+        else:
+            grid_cost, danger_zones = build_cost_map(W, H, mines, obstacle_threshold)
 
         # clamp start/goal inside bounds
         sx, sy = max(0, min(W-1, start[0])), max(0, min(H-1, start[1]))
         gx, gy = max(0, min(W-1, goal[0])), max(0, min(H-1, goal[1]))
 
-        path = a_star(grid_cost, (sx, sy), (gx, gy))
-        if path is None:
-            # if no path found, try relaxing costs by halving temporarily
-            flat = [[c * 0.5 for c in col] for col in grid_cost]
-            path = a_star(flat, (sx, sy), (gx, gy))
+        coverage = None
+        anytime = None
+        if mode == "coverage":
+            coverage = coverage_path(grid_cost, (sx, sy), lane_spacing, obstacle_cost(obstacle_threshold))
+            path_coords = coverage["path"].tolist()
+        elif time_budget_ms is not None:
+            # anytime (ARA*) search: best path within the budget, refinement continues in the background
+            planner = AnytimePlanner(grid_cost, (sx, sy), (gx, gy),
+                                     eps_start=float(payload.get("initial_inflation", 3.0)))
+            planner.run(received + time_budget_ms / 1000.0)
+            anytime = planner.snapshot()
+            # empty when the first pass missed the budget: never guess a route, poll plan_id instead
+            path_coords = anytime.pop("path")
+            if not planner.done:
+                anytime["plan_id"] = refine_in_background(planner)
+                anytime["refining"] = True
+        else:
+            cost_list = grid_cost.tolist()
+            path = a_star(cost_list, (sx, sy), (gx, gy))
+            if path is None:
+                # if no path found, try relaxing costs by halving temporarily
+                flat = [[c * 0.5 for c in col] for col in cost_list]
+                path = a_star(flat, (sx, sy), (gx, gy))
 
-        # Convert path to list of lists
-        path_coords = [ [int(x), int(y)] for (x,y) in path ] if path else []
+            # Convert path to list of lists
+            path_coords = [ [int(x), int(y)] for (x,y) in path ] if path else []
 
         response = {
             "grid_size": [W, H],
@@ -278,6 +458,18 @@ def generate_path():
             # For frontend demo we include a sparse sample of costs for visualization (downsampled)
             "grid_cost_sample": None
         }
+        if coverage is not None:
+            response["mode"] = "coverage"
+            response["lane_spacing"] = lane_spacing
+            response["coverage_percent"] = coverage["coverage_percent"]
+            response["path_length"] = coverage["path_length"]
+            response["cells"] = coverage["cells"]
+        if anytime is not None:
+            response.update(anytime)
+        if compact:
+            response.pop("path")
+            response["path_encoded"] = encode_path(path_coords)
+            response["grid_cost_sample"] = encode_cost_map(grid_cost, max_cost_side)
 
         logging.info(f"Generated path start={start} goal={goal} mines={len(danger_zones)} path_len={len(path_coords)}")
         return jsonify(response), 200
@@ -285,3 +477,32 @@ def generate_path():
     except Exception as e:
         logging.error(f"Path generation error: {e}")
         return jsonify({"error": str(e)}), 500
+
+
+@bp.route("/path/plan/<plan_id>", methods=["GET"])
+def get_refined_path(plan_id):
+    """
+    Latest result of an anytime plan started with time_budget_ms.
+    ---
+    parameters:
+      - name: compact
+        in: query
+        type: boolean
+    responses:
+      200:
+        description: Best path so far with its suboptimality bound
+      404:
+        description: Unknown or expired plan
+    """
+    planner = get_plan(plan_id)
+    if planner is None:
+        return jsonify({"error": "Unknown or expired plan."}), 404
+    result = planner.snapshot()
+    result["plan_id"] = plan_id
+    try:
+        compact = _parse_flag(request.args.get("compact", ""))
+    except ValueError as e:
+        return jsonify({"error": f"compact: {e}"}), 400
+    if compact:
+        result["path_encoded"] = encode_path(result.pop("path"))
+    return jsonify(result), 200
@@ -0,0 +1,124 @@
+# backend/app/routes/profiling_routes.py
+from flask import Blueprint, request, jsonify, Response
+import logging
+
+from app.utils.profiler import profiler
+
+profiling_bp = Blueprint("profiling_bp", __name__)
+
+
+@profiling_bp.before_request
+def require_admin():
+    # 404 rather than 401 so the endpoint is invisible without the token
+    if not profiler.is_admin(request):
+        return jsonify({"error": "Not found"}), 404
+
+
+@profiling_bp.route("/admin/profiling", methods=["GET"])
+def profiling_status():
+    """
+    Profiler settings and the slowest stored profiles per endpoint.
+    ---
+    tags:
+      - Admin
+    parameters:
+      - name: X-Profile-Token
+        in: header
+        type: string
+        required: true
+    responses:
+      200:
+        description: Settings and per-endpoint profile index
+      404:
+        description: Missing or wrong admin token
+    """
+    return jsonify(profiler.status()), 200
+
+
+@profiling_bp.route("/admin/profiling", methods=["POST"])
+def configure_profiling():
+    """
+    Switch sampling on/off and tune it.
+    ---
+    tags:
+      - Admin
+    parameters:
+      - name: X-Profile-Token
+        in: header
+        type: string
+        required: true
+      - name: body
+        in: body
+        schema:
+          type: object
+          properties:
+            enabled: {type: boolean, example: true}
+            sample_rate: {type: number, example: 0.05}
+            top_n: {type: integer, example: 5}
+            mode: {type: string, enum: [cprofile, sampler]}
+            interval_ms: {type: number, example: 5}
+    responses:
+      200:
+        description: New settings
+      400:
+        description: Invalid settings
+    """
+    try:
+        payload = request.get_json(silent=True) or {}
+        profiler.configure(
+            enabled=payload.get("enabled"),
+            sample_rate=payload.get("sample_rate"),
+            top_n=payload.get("top_n"),
+            mode=payload.get("mode"),
+            interval_ms=payload.get("interval_ms"),
+        )
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+    status = profiler.status()
+    status.pop("endpoints")
+    logging.info(f"Profiler configured: {status}")
+    return jsonify(status), 200
+
+
+@profiling_bp.route("/admin/profiling", methods=["DELETE"])
+def clear_profiles():
+    """
+    Drop all stored profiles.
+    ---
+    tags:
+      - Admin
+    responses:
+      200:
+        description: Cleared
+    """
+    profiler.clear()
+    return jsonify({"message": "Profiles cleared"}), 200
+
+
+@profiling_bp.route("/admin/profiling/<int:profile_id>", methods=["GET"])
+def download_profile(profile_id):
+    """
+    Download one profile: .pstats for cProfile runs, collapsed stacks for sampler runs.
+    ---
+    tags:
+      - Admin
+    parameters:
+      - name: profile_id
+        in: path
+        type: integer
+        required: true
+    responses:
+      200:
+        description: pstats (load with pstats.Stats / snakeviz) or collapsed stacks (flamegraph.pl / speedscope)
+      404:
+        description: Unknown or evicted profile
+    """
+    rec = profiler.get(profile_id)
+    if rec is None:
+        return jsonify({"error": "Unknown profile"}), 404
+    if rec["mode"] == "cprofile":
+        filename, mimetype = f"profile-{profile_id}.pstats", "application/octet-stream"
+    else:
+        filename, mimetype = f"profile-{profile_id}.collapsed", "text/plain"
+    return Response(rec["data"], mimetype=mimetype,
+                    headers={"Content-Disposition": f"attachment; filename={filename}"})
@@ -0,0 +1,155 @@
+# backend/app/routes/risk_routes.py
+from flask import Blueprint, request, jsonify, current_app
+import logging
+import os
+import re
+
+from app.utils.encoding import encode_cost_map
+from app.utils.risk_grid import create_grid, get_grid, snapshot_path
+
+risk_bp = Blueprint("risk_bp", __name__)
+
+MISSION_ID_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+MAX_SIDE = 1000   # float32 grid: 4 MB at the limit
+MAX_SIGMA = 10.0  # footprint is (6 * sigma + 1)^2 cells per reading
+
+
+def risk_dir():
+    path = os.getenv("RISK_GRID_DIR") or os.path.join(current_app.instance_path, "risk_grids")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def mission_grid(mission_id):
+    if not MISSION_ID_RE.match(str(mission_id)):
+        return None
+    return get_grid(mission_id, risk_dir())
+
+
+@risk_bp.route("/risk/<mission_id>", methods=["POST"])
+def create_mission(mission_id):
+    """
+    Create (or reset) a mission risk grid.
+    ---
+    tags:
+      - Risk
+    parameters:
+      - name: body
+        in: body
+        schema:
+          type: object
+          properties:
+            width: {type: integer, example: 40, description: 1 to 1000}
+            height: {type: integer, example: 30, description: 1 to 1000}
+            prior: {type: number, example: 0.05}
+            sigma: {type: number, example: 1.5, description: reading footprint in cells (0 to 10)}
+            half_life_s: {type: number, example: 600, description: evidence half-life, 0 disables decay}
+    responses:
+      201:
+        description: Grid summary
+      400:
+        description: Invalid parameters or mission limit reached
+    """
+    if not MISSION_ID_RE.match(mission_id):
+        return jsonify({"error": "mission_id must be 1-64 letters, digits, '-' or '_'"}), 400
+    try:
+        payload = request.get_json(silent=True) or {}
+        width = int(payload.get("width", 40))
+        height = int(payload.get("height", 30))
+        sigma = float(payload.get("sigma", 1.5))
+        if not (1 <= width <= MAX_SIDE and 1 <= height <= MAX_SIDE):
+            return jsonify({"error": f"width and height must be between 1 and {MAX_SIDE}"}), 400
+        if not 0 <= sigma <= MAX_SIGMA:
+            return jsonify({"error": f"sigma must be between 0 and {MAX_SIGMA:g}"}), 400
+        grid = create_grid(
+            mission_id,
+            width=width,
+            height=height,
+            prior=float(payload.get("prior", 0.05)),
+            sigma=sigma,
+            half_life_s=float(payload.get("half_life_s", 600.0)),
+        )
+        return jsonify({"mission_id": mission_id, **grid.summary()}), 201
+    except Exception as e:
+        logging.error(f"Risk grid create error: {e}")
+        return jsonify({"error": str(e)}), 400
+
+
+@risk_bp.route("/risk/<mission_id>/update", methods=["POST"])
+def update_mission(mission_id):
+    """
+    Fuse a batch of geotagged mine probabilities into the mission grid.
+    ---
+    tags:
+      - Risk
+    parameters:
+      - name: body
+        in: body
+        required: true
+        description: columnar {"x":[..],"y":[..],"probability":[..]} or {"readings":[{"x","y","probability"}, ...]}
+    responses:
+      200:
+        description: Grid summary
+      404:
+        description: Unknown mission
+    """
+    grid = mission_grid(mission_id)
+    if grid is None:
+        return jsonify({"error": "Unknown mission."}), 404
+    try:
+        payload = request.get_json(force=True)
+        if "readings" in payload:
+            rs = payload["readings"]
+            xs = [r["x"] for r in rs]; ys = [r["y"] for r in rs]; ps = [r["probability"] for r in rs]
+        else:
+            xs, ys, ps = payload["x"], payload["y"], payload["probability"]
+        grid.update(xs, ys, ps)
+        return jsonify({"mission_id": mission_id, **grid.summary()}), 200
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid readings: {e}"}), 400
+
+
+@risk_bp.route("/risk/<mission_id>", methods=["GET"])
+def get_mission(mission_id):
+    """
+    Mission grid summary plus the probability map (uint8/base64, see app/utils/encoding.py).
+    ---
+    tags:
+      - Risk
+    responses:
+      200:
+        description: Summary and encoded probability map
+      404:
+        description: Unknown mission
+    """
+    grid = mission_grid(mission_id)
+    if grid is None:
+        return jsonify({"error": "Unknown mission."}), 404
+    max_side = request.args.get("max_side", 256, type=int)
+    if max_side < 1:
+        return jsonify({"error": "max_side must be a positive integer"}), 400
+    return jsonify({
+        "mission_id": mission_id,
+        **grid.summary(),
+        "probability_map": encode_cost_map(grid.probability(), max_side),
+    }), 200
+
+
+@risk_bp.route("/risk/<mission_id>/snapshot", methods=["POST"])
+def snapshot_mission(mission_id):
+    """
+    Persist the mission grid so it is reloaded after a restart.
+    ---
+    tags:
+      - Risk
+    responses:
+      200:
+        description: Snapshot written
+      404:
+        description: Unknown mission
+    """
+    grid = mission_grid(mission_id)
+    if grid is None:
+        return jsonify({"error": "Unknown mission."}), 404
+    grid.save(snapshot_path(risk_dir(), mission_id))
+    return jsonify({"mission_id": mission_id, "saved": True}), 200
@@ -0,0 +1,99 @@
+# backend/app/routes/simulation_routes.py
+from flask import Blueprint, request, jsonify
+import logging
+import os
+import time
+
+from app.routes.predict_routes import PIPE_PATH, get_pipeline
+from app.utils.simulation import run_simulation
+
+sim_bp = Blueprint("sim_bp", __name__)
+
+MAX_TRIALS = 5000
+MAX_SIDE = 200
+MAX_MINES = 100
+# runs inside the request: keep the estimate well under gunicorn's 30 s worker timeout
+MAX_RUN_S = 20.0
+# single-process cost with ~2x margin over measured (~12 ms per trial + ~24 us per cell);
+# a worker pool also pays process start-up plus one pipeline unpickle (~1.8 s) per worker
+TRIAL_S = 0.03
+CELL_S = 50e-6
+POOL_START_S = 4.0
+
+
+def estimate_seconds(trials, width, height, workers):
+    startup = POOL_START_S if workers > 1 else 0.0
+    return startup + trials * (TRIAL_S + CELL_S * width * height) / workers
+
+
+@sim_bp.route("/simulate/minefield", methods=["POST"])
+def simulate_minefield():
+    """
+    Monte Carlo statistics over randomized minefields.
+    ---
+    tags:
+      - Simulation
+    parameters:
+      - name: body
+        in: body
+        schema:
+          type: object
+          properties:
+            trials: {type: integer, example: 500}
+            seed: {type: integer, example: 0}
+            workers: {type: integer, example: 4, description: "clamped to the CPU count"}
+            width: {type: integer, example: 40}
+            height: {type: integer, example: 30}
+            mines: {type: integer, example: 6, description: "0 to 100"}
+            threshold: {type: number, example: 0.5}
+    responses:
+      200:
+        description: Detection rate, false alarms, path length/risk and strike rate (mean/std/percentiles)
+      400:
+        description: Invalid parameters, or an estimated run time above 20 s (lower trials or grid size)
+      500:
+        description: Server error
+    """
+    try:
+        payload = request.get_json(silent=True) or {}
+        trials = int(payload.get("trials", 200))
+        width = int(payload.get("width", 40))
+        height = int(payload.get("height", 30))
+        if not 1 <= trials <= MAX_TRIALS:
+            return jsonify({"error": f"trials must be between 1 and {MAX_TRIALS}"}), 400
+        if not (6 <= width <= MAX_SIDE and 6 <= height <= MAX_SIDE):
+            return jsonify({"error": f"width and height must be between 6 and {MAX_SIDE}"}), 400
+        mines = int(payload["mines"]) if "mines" in payload else None
+        if mines is not None and not 0 <= mines <= MAX_MINES:
+            return jsonify({"error": f"mines must be between 0 and {MAX_MINES}"}), 400
+        cpus = os.cpu_count() or 1
+        workers = int(payload.get("workers", min(4, cpus)))
+        workers = max(1, min(workers, cpus))
+        estimate = estimate_seconds(trials, width, height, workers)
+        if estimate > MAX_RUN_S:
+            return jsonify({"error": f"Estimated run time {estimate:.0f}s exceeds {MAX_RUN_S:.0f}s; "
+                                     f"reduce trials or grid size"}), 400
+
+        # a single process scores with the already-loaded pipeline instead of unpickling it again
+        pipeline = get_pipeline() if workers <= 1 else None
+        if workers <= 1 and pipeline is None:
+            return jsonify({"error": "Model not loaded on server."}), 500
+
+        t0 = time.perf_counter()
+        report = run_simulation(
+            PIPE_PATH,
+            pipeline=pipeline,
+            trials=trials,
+            seed=int(payload.get("seed", 0)),
+            workers=workers,
+            width=width,
+            height=height,
+            mines=mines,
+            threshold=float(payload["threshold"]) if "threshold" in payload else None,
+        )
+        report["elapsed_s"] = round(time.perf_counter() - t0, 2)
+        logging.info(f"Simulation trials={trials} seed={report['seed']} took={report['elapsed_s']}s")
+        return jsonify(report), 200
+    except Exception as e:
+        logging.error(f"Simulation error: {e}")
+        return jsonify({"error": str(e)}), 500
@@ -0,0 +1,171 @@
+# backend/app/utils/drift.py
+"""
+Online input-drift monitoring against training-time reference profiles.
+
+A reference profile (JSON, written by the training scripts via
+build_reference) holds per-feature mean/std and a histogram over quantile
+bin edges (0.5th to 99.5th percentile) with underflow/overflow bins, so
+heavy-tailed features such as Metal_Mag_Ratio still spread over every bin. DriftMonitor keeps the same statistics for live
+inputs: Welford/Chan mean and M2 merged batch-wise, and histogram counts from
+one vectorized bin computation. observe() only queues rows; they are merged
+every `flush_rows` rows or on report, so a single prediction costs a list
+append. Old evidence fades with a half-life in rows so recent faults are not
+diluted by weeks of healthy data.
+
+Drift per feature is the population stability index (PSI) between reference
+and live bin proportions; the overall score is the worst feature. With 10
+bins and at least 500 live rows, in-distribution samples stay below 0.1.
+"""
+import json
+import threading
+
+import numpy as np
+
+PSI_MODERATE = 0.1
+PSI_DRIFT = 0.25
+EPS = 1e-4
+
+
+def build_reference(X, names, bins=10):
+    """Reference profile dict for an (n, len(names)) training matrix."""
+    X = np.asarray(X, dtype=np.float64)
+    # equal-mass bins: fixed-width edges put a heavy-tailed ratio entirely in one bin.
+    # Repeated quantiles (point masses) give zero-width bins, empty on both sides.
+    edges = np.percentile(X, np.linspace(0.5, 99.5, bins + 1), axis=0).T
+    ref = {"features": list(names), "bins": int(bins), "edges": edges.tolist(),
+           "n": int(len(X)), "mean": X.mean(axis=0).tolist(), "std": X.std(axis=0).tolist()}
+    counts = _bin_counts(X, edges)
+    ref["hist"] = (counts / counts.sum(axis=1, keepdims=True)).tolist()
+    return ref
+
+
+def save_reference(ref, path):
+    with open(path, "w") as f:
+        json.dump(ref, f, indent=2)
+
+
+def _bin_counts(X, edges):
+    """(features, bins + 2) counts over per-feature edges; column 0 is underflow, column bins + 1 overflow."""
+    n_feat, n_edges = edges.shape
+    bins = n_edges - 1
+    idx = np.empty(X.shape, dtype=np.int64)
+    for f in range(n_feat):
+        e = edges[f]
+        col = np.searchsorted(e[1:-1], X[:, f], side="right") + 1
+        col[X[:, f] < e[0]] = 0
+        col[X[:, f] > e[-1]] = bins + 1
+        idx[:, f] = col
+    idx += np.arange(n_feat, dtype=np.int64) * (bins + 2)
+    return np.bincount(idx.ravel(), minlength=n_feat * (bins + 2)).reshape(n_feat, bins + 2).astype(np.float64)
+
+
+def psi(ref_p, live_p):
+    r = np.maximum(ref_p, EPS)
+    l = np.maximum(live_p, EPS)
+    return ((l - r) * np.log(l / r)).sum(axis=-1)
+
+
+class DriftMonitor:
+    def __init__(self, reference, flush_rows=256, half_life_rows=20000, min_rows=500):
+        self.reference = reference
+        self.features = reference["features"]
+        self.bins = int(reference["bins"])
+        self.edges = np.asarray(reference["edges"], dtype=np.float64)
+        self.ref_hist = np.asarray(reference["hist"], dtype=np.float64)
+        self.ref_mean = np.asarray(reference["mean"], dtype=np.float64)
+        self.ref_std = np.asarray(reference["std"], dtype=np.float64)
+        self.flush_rows = int(flush_rows)
+        self.half_life_rows = float(half_life_rows) if half_life_rows else None
+        self.min_rows = int(min_rows)
+        self.lock = threading.Lock()
+        self.reset()
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        with open(path) as f:
+            return cls(json.load(f), **kwargs)
+
+    def reset(self):
+        n_feat = len(self.features)
+        with self.lock:
+            self.n = 0.0                      # effective (decayed) row count
+            self.mean = np.zeros(n_feat)
+            self.m2 = np.zeros(n_feat)
+            self.counts = np.zeros((n_feat, self.bins + 2))
+            self.total_rows = 0
+            self._pending = []
+            self._pending_rows = 0
+
+    def observe(self, X):
+        """Queue one row or a batch; merged in bulk every flush_rows rows."""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X[None, :]
+        with self.lock:
+            self._pending.append(X)
+            self._pending_rows += len(X)
+            if self._pending_rows >= self.flush_rows:
+                self._flush()
+
+    def _flush(self):
+        if not self._pending:
+            return
+        X = np.concatenate(self._pending) if len(self._pending) > 1 else self._pending[0]
+        self._pending = []
+        self._pending_rows = 0
+        X = X[np.isfinite(X).all(axis=1)]
+        nb = len(X)
+        if nb == 0:
+            return
+
+        if self.half_life_rows is not None and self.n > 0:
+            # scaling n, M2 and counts together keeps mean/variance unbiased
+            f = 0.5 ** (nb / self.half_life_rows)
+            self.n *= f
+            self.m2 *= f
+            self.counts *= f
+
+        mean_b = X.mean(axis=0)
+        m2_b = ((X - mean_b) ** 2).sum(axis=0)
+        n = self.n + nb
+        delta = mean_b - self.mean
+        self.mean += delta * (nb / n)
+        self.m2 += m2_b + delta ** 2 * (self.n * nb / n)
+        self.n = n
+        self.counts += _bin_counts(X, self.edges)
+        self.total_rows += nb
+
+    def report(self):
+        with self.lock:
+            self._flush()
+            n, mean, m2, counts, total = self.n, self.mean.copy(), self.m2.copy(), self.counts.copy(), self.total_rows
+        if total < self.min_rows:
+            return {"status": "insufficient_data", "rows": total, "min_rows": self.min_rows}
+
+        std = np.sqrt(m2 / n) if n > 0 else np.zeros_like(mean)
+        live_p = counts / counts.sum(axis=1, keepdims=True)
+        scores = psi(self.ref_hist, live_p)
+        shift = np.abs(mean - self.ref_mean) / np.where(self.ref_std > 0, self.ref_std, 1.0)
+        out_of_range = live_p[:, 0] + live_p[:, -1]
+        worst = int(np.argmax(scores))
+        score = float(scores[worst])
+        status = "drift" if score >= PSI_DRIFT else "moderate" if score >= PSI_MODERATE else "stable"
+        return {
+            "status": status,
+            "drift_score": round(score, 4),
+            "worst_feature": self.features[worst],
+            "rows": total,
+            "effective_rows": round(float(n), 1),
+            "features": {
+                name: {
+                    "psi": round(float(scores[i]), 4),
+                    "mean": round(float(mean[i]), 4),
+                    "std": round(float(std[i]), 4),
+                    "ref_mean": round(float(self.ref_mean[i]), 4),
+                    "ref_std": round(float(self.ref_std[i]), 4),
+                    "mean_shift_sd": round(float(shift[i]), 3),
+                    "out_of_range": round(float(out_of_range[i]), 4),
+                }
+                for i, name in enumerate(self.features)
+            },
+        }
@@ -0,0 +1,87 @@
+# backend/app/utils/encoding.py
+"""
+Compact wire formats for grids and paths, used when a client asks for them
+(e.g. "compact": true on /path/generate).
+
+Cost maps: block-max downsampled, linearly quantized to uint8, base64.
+    value ~= offset + q * scale, array shape = "shape", x-major ([x][y]) like grid_cost.
+Paths: start cell + run-length encoded 8-connected direction codes.
+"""
+import base64
+import numpy as np
+
+# direction code -> (dx, dy), counter-clockwise starting east
+DIRECTIONS = [(1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1)]
+
+# (dx + 1) * 3 + (dy + 1) -> direction code, -1 for (0, 0)
+_DELTA_TO_CODE = np.full(9, -1, dtype=np.int8)
+for _code, (_dx, _dy) in enumerate(DIRECTIONS):
+    _DELTA_TO_CODE[(_dx + 1) * 3 + (_dy + 1)] = _code
+
+
+def encode_cost_map(grid, max_side=256) -> dict:
+    arr = np.asarray(grid, dtype=np.float32)
+    w, h = arr.shape
+    if int(max_side) < 1:
+        raise ValueError("max_side must be at least 1")
+    block = max(1, -(-max(w, h) // int(max_side)))
+    if block > 1:
+        # keep the most dangerous value of every block so hazards never vanish when zoomed out
+        pw, ph = -w % block, -h % block
+        if pw or ph:
+            arr = np.pad(arr, ((0, pw), (0, ph)), mode="edge")
+        arr = arr.reshape(arr.shape[0] // block, block, arr.shape[1] // block, block).max(axis=(1, 3))
+    offset = float(arr.min())
+    span = float(arr.max()) - offset
+    scale = span / 255.0 if span > 0 else 1.0
+    q = np.rint((arr - offset) / scale).astype(np.uint8)
+    return {
+        "shape": [int(q.shape[0]), int(q.shape[1])],
+        "block": int(block),
+        "order": "x-major",
+        "dtype": "uint8",
+        "offset": offset,
+        "scale": scale,
+        "data": base64.b64encode(q.tobytes()).decode("ascii"),
+    }
+
+
+def decode_cost_map(encoded: dict) -> np.ndarray:
+    q = np.frombuffer(base64.b64decode(encoded["data"]), dtype=np.uint8).reshape(encoded["shape"])
+    return encoded["offset"] + q.astype(np.float32) * encoded["scale"]
+
+
+def encode_path(path) -> dict:
+    pts = np.asarray(path, dtype=np.int64).reshape(-1, 2)
+    if len(pts) == 0:
+        return {"start": None, "length": 0, "runs": []}
+    d = np.diff(pts, axis=0)
+    if d.size and np.abs(d).max() > 1:
+        raise ValueError("Path has non-adjacent steps; cannot direction-encode it")
+    codes = _DELTA_TO_CODE[(d[:, 0] + 1) * 3 + (d[:, 1] + 1)]
+    codes = codes[codes >= 0]  # drop repeated cells
+    runs = []
+    if codes.size:
+        breaks = np.flatnonzero(np.diff(codes)) + 1
+        starts = np.concatenate(([0], breaks))
+        counts = np.diff(np.concatenate((starts, [codes.size])))
+        runs = np.stack([codes[starts], counts], axis=1).tolist()
+    return {
+        "start": [int(pts[0, 0]), int(pts[0, 1])],
+        "length": int(codes.size + 1),
+        "runs": runs,  # [[direction_code, repeat], ...]
+        "directions": DIRECTIONS,
+    }
+
+
+def decode_path(encoded: dict) -> list:
+    if not encoded["start"]:
+        return []
+    x, y = encoded["start"]
+    out = [[x, y]]
+    for code, count in encoded["runs"]:
+        dx, dy = DIRECTIONS[code]
+        for _ in range(count):
+            x += dx; y += dy
+            out.append([x, y])
+    return out
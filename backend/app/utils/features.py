@@ -0,0 +1,61 @@
+# backend/app/utils/features.py
+"""
+Feature engineering for the mine detection pipeline.
+
+The pipeline was trained on the four raw sensor channels plus four columns
+derived from Metal_Level (ML) and Magnetic_Field (MF) in the training notebook:
+
+    Metal_Mag_Ratio  = ML / (MF + 1e-6)
+    Metal_Diff       = ML - MF
+    Metal_Mag_Energy = sqrt(ML^2 + MF^2)
+    Metal_Mag_Avg    = (ML + MF) / 2
+
+derive_features reproduces that math in float64, one vectorized pass per batch,
+so clients can send either the 4 raw channels or the full 8-column row.
+"""
+import numpy as np
+
+RAW_CHANNELS = ['Metal_Level', 'Magnetic_Field', 'Ground_Density', 'Thermal_Signature']
+DERIVED = ['Metal_Mag_Ratio', 'Metal_Diff', 'Metal_Mag_Energy', 'Metal_Mag_Avg']
+FEATURES = RAW_CHANNELS + DERIVED
+
+RATIO_EPS = 1e-6
+
+
+def derive_features(raw):
+    """(n, 4) raw channels -> (n, 8) float64 rows in FEATURES order."""
+    raw = np.asarray(raw, dtype=np.float64)
+    n = raw.shape[0]
+    out = np.empty((n, len(FEATURES)))
+    out[:, :4] = raw
+    ml, mf = raw[:, 0], raw[:, 1]
+    den = mf + RATIO_EPS
+    # training data never hit den == 0 (MF >= 0); map it to the MF == 0 value instead of inf
+    den[den == 0] = RATIO_EPS
+    np.divide(ml, den, out=out[:, 4])
+    np.subtract(ml, mf, out=out[:, 5])
+    # same operation order as the notebook (not np.hypot) so results are bit-identical
+    np.sqrt(ml ** 2 + mf ** 2, out=out[:, 6])
+    np.divide(ml + mf, 2.0, out=out[:, 7])
+    return out
+
+
+def prepare_features(X):
+    """
+    Model-ready (n, 8) matrix from a single row or batch of either 4 raw
+    channels or the full FEATURES row. Raises ValueError otherwise.
+    Full rows keep their float dtype, so float32 frames are scored as before.
+    """
+    X = np.asarray(X)
+    if X.dtype.kind != "f":
+        X = X.astype(np.float64)
+    if X.ndim == 1:
+        X = X.reshape(1, -1)
+    if X.ndim != 2 or X.shape[0] == 0:
+        raise ValueError("Expected one row or a list of rows")
+    if X.shape[1] == len(RAW_CHANNELS):
+        return derive_features(X)
+    if X.shape[1] == len(FEATURES):
+        return X
+    raise ValueError(f"Expected {len(RAW_CHANNELS)} raw values {RAW_CHANNELS} "
+                     f"or {len(FEATURES)} values in order {FEATURES}")
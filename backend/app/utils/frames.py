@@ -0,0 +1,103 @@
+# backend/app/utils/frames.py
+"""
+Binary sensor frames for high-rate telemetry (/api/ingest/frames).
+
+Request (application/octet-stream), all little-endian:
+    magic   4s  b"IMF1"
+    version u8  1
+    layout  u8  feature layout code (see LAYOUTS): 0 = 8 FEATURES, 1 = 4 raw channels
+    cols    u16 values per row
+    rows    u32 number of rows
+    data    rows * cols float32, row-major
+
+Response (application/octet-stream):
+    magic b"IMR1", version u8, flags u8 (0), reserved u16 (0), rows u32,
+    then rows float32 probabilities, then rows uint8 predictions.
+
+msgpack bodies carry the same fields as a map with the payload as raw
+bytes: {"layout": 0, "rows": n, "cols": c, "data": <float32 bytes>}.
+"""
+import struct
+
+import numpy as np
+
+try:
+    import msgpack
+except ImportError:  # optional: only needed for application/msgpack bodies
+    msgpack = None
+
+FRAME_MAGIC = b"IMF1"
+RESULT_MAGIC = b"IMR1"
+VERSION = 1
+HEADER = struct.Struct("<4sBBHI")
+
+# layout code -> number of columns; 0 is the full FEATURES order of /predict/mine,
+# 1 the raw sensor channels only (derived columns are computed server-side)
+LAYOUTS = {0: 8, 1: 4}
+
+MSGPACK_TYPES = ("application/msgpack", "application/x-msgpack")
+OCTET_TYPE = "application/octet-stream"
+
+
+class FrameError(ValueError):
+    pass
+
+
+def _check_shape(layout, rows, cols):
+    if rows < 1:
+        raise FrameError("Frame has no rows")
+    if layout not in LAYOUTS:
+        raise FrameError(f"Unknown layout {layout}; known layouts: {sorted(LAYOUTS)}")
+    if cols != LAYOUTS[layout]:
+        raise FrameError(f"Layout {layout} has {LAYOUTS[layout]} columns, header says {cols}")
+
+
+def decode_frames(body: bytes):
+    """Return (layout, (rows, cols) float32 array view over `body`)."""
+    if len(body) < HEADER.size:
+        raise FrameError("Body shorter than frame header")
+    magic, version, layout, cols, rows = HEADER.unpack_from(body)
+    if magic != FRAME_MAGIC or version != VERSION:
+        raise FrameError("Bad frame magic/version")
+    _check_shape(layout, rows, cols)
+    expected = HEADER.size + rows * cols * 4
+    if len(body) != expected:
+        raise FrameError(f"Body is {len(body)} bytes, header implies {expected}")
+    X = np.frombuffer(body, dtype="<f4", count=rows * cols, offset=HEADER.size).reshape(rows, cols)
+    return layout, X
+
+
+def decode_msgpack_frames(body: bytes):
+    if msgpack is None:
+        raise FrameError("msgpack is not installed on the server")
+    try:
+        msg = msgpack.unpackb(body, raw=False)
+    except Exception as e:  # ExtraData, FormatError, StackError, ... share no useful base
+        raise FrameError(f"Invalid msgpack body: {e or type(e).__name__}")
+    try:
+        layout, rows, cols, data = int(msg["layout"]), int(msg["rows"]), int(msg["cols"]), msg["data"]
+    except (KeyError, TypeError, ValueError):
+        raise FrameError("msgpack frame needs layout, rows, cols and data")
+    if not isinstance(data, (bytes, bytearray)):
+        raise FrameError("msgpack data must be raw float32 bytes (bin type)")
+    _check_shape(layout, rows, cols)
+    if len(data) != rows * cols * 4:
+        raise FrameError(f"data is {len(data)} bytes, expected {rows * cols * 4}")
+    return layout, np.frombuffer(data, dtype="<f4").reshape(rows, cols)
+
+
+def encode_results(pred: np.ndarray, proba: np.ndarray) -> bytes:
+    rows = len(pred)
+    return b"".join((
+        HEADER.pack(RESULT_MAGIC, VERSION, 0, 0, rows),
+        np.asarray(proba, dtype="<f4").tobytes(),
+        np.asarray(pred, dtype=np.uint8).tobytes(),
+    ))
+
+
+def encode_msgpack_results(pred: np.ndarray, proba: np.ndarray) -> bytes:
+    return msgpack.packb({
+        "rows": len(pred),
+        "probability": np.asarray(proba, dtype="<f4").tobytes(),
+        "prediction": np.asarray(pred, dtype=np.uint8).tobytes(),
+    })
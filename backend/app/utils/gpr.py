@@ -0,0 +1,173 @@
+# backend/app/utils/gpr.py
+"""
+Vectorized GPR B-scan processing for the API (same steps as tools/gpr_preprocess.py).
+
+B-scans are (n_traces, n_samples) arrays: one row per trace, depth (two-way
+time samples) along the second axis.
+"""
+import io
+import numpy as np
+
+NPY_MAGIC = b"\x93NUMPY"
+
+
+def decode_bscan(body: bytes, traces=None, samples=None) -> np.ndarray:
+    """
+    Turn an upload into a float32 B-scan without going through Python lists.
+    Accepts either a .npy payload or raw little-endian float32 with an explicit shape.
+    """
+    if body[:6] == NPY_MAGIC:
+        f = io.BytesIO(body)
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+        if dtype.hasobject or len(shape) != 2:
+            raise ValueError("Expected a 2D numeric .npy array")
+        arr = np.frombuffer(body, dtype=dtype, count=int(np.prod(shape)), offset=f.tell())
+        arr = arr.reshape(shape, order="F" if fortran else "C")
+    else:
+        if not traces or not samples:
+            raise ValueError("Raw float32 uploads need 'traces' and 'samples'")
+        traces, samples = int(traces), int(samples)
+        if len(body) != traces * samples * 4:
+            raise ValueError(f"Body is {len(body)} bytes, expected {traces * samples * 4} for {traces}x{samples} float32")
+        arr = np.frombuffer(body, dtype="<f4").reshape(traces, samples)
+    if arr.size <= 100 or min(arr.shape) < 2:
+        raise ValueError("B-scan is too small (needs more than 100 values and at least 2 traces and 2 samples)")
+    return np.ascontiguousarray(arr, dtype=np.float32)
+
+
+def detrend(data: np.ndarray) -> np.ndarray:
+    # least-squares linear detrend of every trace at once (same result as scipy.signal.detrend)
+    n = data.shape[1]
+    t = np.arange(n, dtype=np.float32) - (n - 1) / 2.0
+    slope = (data @ t) / float(np.dot(t, t))
+    return data - data.mean(axis=1, keepdims=True) - slope[:, None] * t
+
+
+def remove_background(data: np.ndarray) -> np.ndarray:
+    # subtract the mean trace to suppress horizontal banding (ground/coupling reflections)
+    return data - data.mean(axis=0, keepdims=True)
+
+
+def preprocess_bscan(data: np.ndarray) -> np.ndarray:
+    return remove_background(detrend(data))
+
+
+def depth_energy(data: np.ndarray) -> np.ndarray:
+    # mean absolute amplitude per depth sample
+    return np.mean(np.abs(data), axis=0)
+
+
+def mean_trace_spectrum(data: np.ndarray, sample_interval=1.0):
+    mean_trace = np.mean(data, axis=0)
+    amp = np.abs(np.fft.rfft(mean_trace))
+    freq = np.fft.rfftfreq(mean_trace.size, d=sample_interval)
+    return freq, amp
+
+
+def _box_mean(a: np.ndarray, rx: int, ry: int) -> np.ndarray:
+    # (2rx+1) x (2ry+1) moving average through an integral image, edges clamped
+    nx, ny = a.shape
+    ii = np.zeros((nx + 1, ny + 1), dtype=np.float64)
+    np.cumsum(np.cumsum(a, axis=0, dtype=np.float64), axis=1, out=ii[1:, 1:])
+    x0 = np.clip(np.arange(nx) - rx, 0, nx); x1 = np.clip(np.arange(nx) + rx + 1, 0, nx)
+    y0 = np.clip(np.arange(ny) - ry, 0, ny); y1 = np.clip(np.arange(ny) + ry + 1, 0, ny)
+    total = ii[x1][:, y1] - ii[x0][:, y1] - ii[x1][:, y0] + ii[x0][:, y0]
+    area = (x1 - x0)[:, None] * (y1 - y0)[None, :]
+    return (total / area).astype(np.float32)
+
+
+def _max_filter(a: np.ndarray, rx: int, ry: int) -> np.ndarray:
+    # separable (2rx+1) x (2ry+1) maximum filter
+    out = a.copy()
+    for axis, r in ((0, rx), (1, ry)):
+        src = out.copy()
+        n = a.shape[axis]
+        for d in range(1, min(r, n - 1) + 1):  # shifts past the edge add nothing
+            lo = [slice(None)] * 2; hi = [slice(None)] * 2
+            lo[axis] = slice(0, n - d); hi[axis] = slice(d, n)
+            np.maximum(out[tuple(lo)], src[tuple(hi)], out=out[tuple(lo)])
+            np.maximum(out[tuple(hi)], src[tuple(lo)], out=out[tuple(hi)])
+    return out
+
+
+def _robust_z(a: np.ndarray) -> np.ndarray:
+    med = np.median(a)
+    mad = np.median(np.abs(a - med)) * 1.4826
+    return (a - med) / (mad + 1e-9)
+
+
+def hyperbola_response(env: np.ndarray, half_width=12, curvatures=(0.5, 1.0, 2.0)) -> np.ndarray:
+    """
+    Mean envelope along point-target diffraction hyperbolas
+    t(x) = sqrt(t0^2 + (k * (x - x0))^2) centred on every (x0, t0).
+    k is the hyperbola slope in samples per trace; the best k wins per cell.
+    """
+    n_traces, n_samples = env.shape
+    w = min(int(half_width), n_traces - 1)  # reflect padding needs w < n_traces
+    # depth-major layout so each gather copies whole contiguous rows
+    padded_t = np.ascontiguousarray(np.pad(env, ((w, w), (0, 0)), mode="reflect").T)
+    t0 = np.arange(n_samples, dtype=np.float32)
+    best = np.zeros((n_samples, n_traces), dtype=np.float32)
+    for k in curvatures:
+        acc = padded_t[:, w:w + n_traces].copy()
+        for dx in range(1, w + 1):
+            # +dx and -dx share the same time shift
+            idx = np.sqrt(t0 ** 2 + (k * dx) ** 2).round().astype(np.intp)
+            np.minimum(idx, n_samples - 1, out=idx)
+            shifted = padded_t[idx]
+            acc += shifted[:, w + dx:w + dx + n_traces]
+            acc += shifted[:, w - dx:w - dx + n_traces]
+        np.maximum(best, acc, out=best)
+    best = best.T
+    return best / (2 * w + 1)
+
+
+def find_targets(score: np.ndarray, min_score=5.0, max_targets=20, separation=(24, 16)):
+    # local maxima of the score map above min_score, strongest first
+    peaks = (score >= _max_filter(score, *separation)) & (score >= min_score)
+    xs, ts = np.nonzero(peaks)
+    order = np.argsort(score[xs, ts])[::-1][:max_targets]
+    return xs[order], ts[order]
+
+
+def analyze_bscan(data: np.ndarray, window=(8, 16), half_width=12, curvatures=(0.5, 1.0, 2.0),
+                  min_score=5.0, max_targets=20, sample_interval=1.0, depth_per_sample=None):
+    """
+    Detrend + background removal, then score every (trace, depth) cell by
+    sliding-window energy and hyperbola coherence. Returns a JSON-ready dict.
+    """
+    proc = preprocess_bscan(np.asarray(data, dtype=np.float32))
+    env = np.abs(proc)
+
+    energy_z = _robust_z(_box_mean(env, window[0], window[1]))
+    hyper_z = _robust_z(hyperbola_response(env, half_width, curvatures))
+    # a buried point target shows both excess energy and a hyperbolic signature
+    score = 0.5 * (energy_z + hyper_z)
+
+    xs, ts = find_targets(score, min_score=min_score, max_targets=max_targets,
+                          separation=(3 * half_width, window[1]))
+    targets = []
+    for x, t in zip(xs.tolist(), ts.tolist()):
+        targets.append({
+            "trace": int(x),
+            "depth_sample": int(t),
+            "depth_m": round(t * depth_per_sample, 4) if depth_per_sample else None,
+            "score": round(float(score[x, t]), 3),
+            "energy_score": round(float(energy_z[x, t]), 3),
+            "hyperbola_score": round(float(hyper_z[x, t]), 3),
+        })
+
+    freq, amp = mean_trace_spectrum(proc, sample_interval)
+    return {
+        "shape": [int(proc.shape[0]), int(proc.shape[1])],
+        "targets": targets,
+        "depth_energy": np.round(depth_energy(proc), 6).tolist(),
+        "spectrum": {
+            "freq": np.round(freq, 6).tolist(),
+            "amplitude": np.round(amp, 6).tolist(),
+        },
+    }
@@ -0,0 +1,433 @@
+# backend/app/utils/path_planning.py
+"""
+Grid path planning used by /path/generate.
+
+Grids are indexed [x][y] (shape (W, H)) with a per-cell traversal cost >= 1.
+"""
+import math
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from heapq import heappush, heappop, heapify
+
+import numpy as np
+
+
+def heuristic(a, b):
+    # Euclidean heuristic
+    return math.hypot(b[0] - a[0], b[1] - a[1])
+
+
+def neighbors(node, max_x, max_y):
+    # 8-connected
+    x, y = node
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            if dx == 0 and dy == 0:
+                continue
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < max_x and 0 <= ny < max_y:
+                yield (nx, ny)
+
+
+def a_star(grid_cost, start, goal):
+    max_x = len(grid_cost)
+    max_y = len(grid_cost[0])
+    open_set = []
+    heappush(open_set, (0 + heuristic(start, goal), 0, start, None))
+    came_from = {}
+    gscore = {start: 0}
+
+    while open_set:
+        f, g, current, _ = heappop(open_set)
+        if current == goal:
+            # reconstruct path
+            path = []
+            node = current
+            while node:
+                path.append(node)
+                node = came_from.get(node)
+            path.reverse()
+            return path
+        for nb in neighbors(current, max_x, max_y):
+            # movement cost = grid_cost at neighbor * movement distance (sqrt2 if diagonal)
+            step_cost = grid_cost[nb[0]][nb[1]]
+            move_cost = math.hypot(nb[0] - current[0], nb[1] - current[1])
+            tentative_g = g + (step_cost * move_cost)
+            if tentative_g < gscore.get(nb, float("inf")):
+                came_from[nb] = current
+                gscore[nb] = tentative_g
+                fscore = tentative_g + heuristic(nb, goal)
+                heappush(open_set, (fscore, tentative_g, nb, current))
+    return None  # no path
+
+
+def random_mines(W, H, rng, count=6):
+    """Demo/simulation layout: `count` mines away from the border with random severity and radius."""
+    mines = []
+    for _ in range(count):
+        mx = rng.randint(2, W-3)
+        my = rng.randint(2, H-3)
+        severity = round(rng.uniform(0.4, 1.0), 2)
+        radius = rng.randint(1, 3)
+        mines.append({"x": mx, "y": my, "radius": radius, "severity": severity})
+    return mines
+
+
+def obstacle_cost(obstacle_threshold):
+    # cells above this cost are treated as (soft) obstacles
+    return 1.0 + obstacle_threshold * 5.0
+
+
+def build_cost_map(W, H, mines, obstacle_threshold=0.75):
+    """
+    Base cost 1.0 plus a severity-scaled bump inside each mine radius;
+    cells above obstacle_cost() are multiplied by 10 (very expensive but passable).
+    Returns (grid_cost as a (W, H) float array, danger_zones).
+    """
+    grid_cost = np.ones((W, H), dtype=np.float64)
+    danger_zones = []
+    for m in mines:
+        mx = int(m.get("x"))
+        my = int(m.get("y"))
+        radius = int(m.get("radius", 2))
+        severity = float(m.get("severity", 0.8))
+        danger_zones.append({"x": mx, "y": my, "radius": radius, "severity": severity})
+        x0, x1 = max(0, mx - radius - 1), min(W, mx + radius + 1)
+        y0, y1 = max(0, my - radius - 1), min(H, my + radius + 1)
+        if x0 >= x1 or y0 >= y1:
+            continue
+        dist = np.hypot(np.arange(x0, x1)[:, None] - mx, np.arange(y0, y1)[None, :] - my)
+        # cost increases quickly near the core
+        add_cost = np.where(dist <= radius + 0.5, 1.0 + severity * (1 + (radius - dist)), 0.0)
+        grid_cost[x0:x1, y0:y1] += add_cost
+
+    limit = obstacle_cost(obstacle_threshold)
+    grid_cost[grid_cost > limit] *= 10.0
+    return grid_cost, danger_zones
+
+
+def _line(a, b):
+    # 8-connected straight segment from a to b, both ends included
+    n = max(abs(b[0] - a[0]), abs(b[1] - a[1]))
+    if n == 0:
+        return np.array([a], dtype=np.int64)
+    t = np.arange(n + 1) / n
+    xs = np.rint(a[0] + (b[0] - a[0]) * t).astype(np.int64)
+    ys = np.rint(a[1] + (b[1] - a[1]) * t).astype(np.int64)
+    return np.stack([xs, ys], axis=1)
+
+
+def _free_segments(free, lanes):
+    # contiguous free runs along y for every lane column at once
+    cols = free[lanes].astype(np.int8)
+    edges = np.diff(np.pad(cols, ((0, 0), (1, 1))), axis=1)
+    lane_idx, y0 = np.nonzero(edges == 1)
+    _, y1 = np.nonzero(edges == -1)
+    return lane_idx, y0, y1 - 1
+
+
+def boustrophedon_cells(free, lanes):
+    """
+    Split the free space into cells of vertically-overlapping lane segments.
+    A cell continues into the next lane only while the connectivity is 1:1;
+    any split or merge (an obstacle's leading or trailing edge) opens new cells.
+    Each cell is a list of (lane_x, y0, y1).
+    """
+    lane_idx, y0s, y1s = _free_segments(free, lanes)
+    cells = []
+    prev = []  # (y0, y1, cell index) on the previous lane
+    start = 0
+    for li, x in enumerate(lanes.tolist()):
+        stop = np.searchsorted(lane_idx, li, side="right")
+        cur = list(zip(y0s[start:stop].tolist(), y1s[start:stop].tolist()))
+        start = stop
+        overlaps = [[j for j, (p0, p1, _) in enumerate(prev) if p0 <= c1 and c0 <= p1] for c0, c1 in cur]
+        prev_counts = [0] * len(prev)
+        for ov in overlaps:
+            for j in ov:
+                prev_counts[j] += 1
+        nxt = []
+        for (c0, c1), ov in zip(cur, overlaps):
+            if len(ov) == 1 and prev_counts[ov[0]] == 1:
+                ci = prev[ov[0]][2]
+            else:
+                ci = len(cells)
+                cells.append([])
+            cells[ci].append((x, c0, c1))
+            nxt.append((c0, c1, ci))
+        prev = nxt
+    return cells
+
+
+# (reverse lane order, first lane upward) for the 4 ways into a cell
+SWEEP_CONFIGS = ((False, True), (False, False), (True, True), (True, False))
+
+
+def _sweep_cell(cell, reverse, upward):
+    """Serpentine through a cell: one (from, to) stroke per lane, alternating direction."""
+    lanes = cell[::-1] if reverse else cell
+    strokes = []
+    up = upward
+    for x, y0, y1 in lanes:
+        strokes.append(((x, y0), (x, y1)) if up else ((x, y1), (x, y0)))
+        up = not up
+    return strokes
+
+
+def _cell_entries(cells):
+    # 4 ways into every cell: first/last lane x starting at the bottom/top
+    entries = np.zeros((len(cells), 4, 2), dtype=np.float64)
+    for i, cell in enumerate(cells):
+        for k, (reverse, upward) in enumerate(SWEEP_CONFIGS):
+            entries[i, k] = _sweep_cell(cell, reverse, upward)[0][0]
+    return entries
+
+
+def coverage_path(grid_cost, start, lane_spacing=1, blocked_above=None):
+    """
+    Boustrophedon coverage of every cell not above `blocked_above`.
+    Lanes run along y, `lane_spacing` cells apart in x. Cells are visited in
+    greedy nearest-entry order from `start`; transits use a straight or
+    L-shaped line when it is obstacle-free and fall back to A* otherwise.
+    Returns dict(path=(N, 2) int array, coverage_percent, path_length, cells).
+    """
+    cost = np.asarray(grid_cost, dtype=np.float64)
+    W, H = cost.shape
+    s = max(1, int(lane_spacing))
+    free = cost <= blocked_above if blocked_above is not None else np.ones_like(cost, dtype=bool)
+
+    # lane x covers [x - s//2, x + (s-1) - s//2]
+    lo, hi = s // 2, (s - 1) - s // 2
+    lanes = np.arange(min(lo, W - 1), W, s)
+    if lanes[-1] + hi < W - 1:
+        lanes = np.append(lanes, W - 1 - hi)
+
+    cells = boustrophedon_cells(free, lanes)
+    pieces = [np.array([start], dtype=np.int64)]
+    pos = tuple(start)
+    cost_list = None
+
+    def connect(a, b):
+        nonlocal cost_list
+        seg = _line(a, b)
+        if free[seg[:, 0], seg[:, 1]].all():
+            return seg
+        # lane-to-lane hops usually only clip an obstacle corner: try both L-shaped detours
+        for corner in ((a[0], b[1]), (b[0], a[1])):
+            detour = np.concatenate([_line(a, corner), _line(corner, b)[1:]])
+            if free[detour[:, 0], detour[:, 1]].all():
+                return detour
+        if cost_list is None:
+            # blocked cells are impassable here (infinite cost), not just expensive
+            cost_list = np.where(free, cost, np.inf).tolist()
+        route = a_star(cost_list, tuple(a), tuple(b))
+        return np.array(route, dtype=np.int64) if route else seg
+
+    if cells:
+        entries = _cell_entries(cells)
+        remaining = np.ones(len(cells), dtype=bool)
+        for _ in range(len(cells)):
+            d = np.hypot(entries[..., 0] - pos[0], entries[..., 1] - pos[1])
+            d[~remaining] = np.inf
+            ci, k = np.unravel_index(np.argmin(d), d.shape)
+            remaining[ci] = False
+            for a, b in _sweep_cell(cells[ci], *SWEEP_CONFIGS[k]):
+                pieces.append(connect(pos, a))
+                pieces.append(_line(a, b))
+                pos = b
+
+    path = np.concatenate(pieces)
+    keep = np.ones(len(path), dtype=bool)
+    keep[1:] = np.any(path[1:] != path[:-1], axis=1)
+    path = path[keep]
+
+    covered = np.zeros((W, H), dtype=bool)
+    for off in range(-lo, hi + 1):
+        xs = path[:, 0] + off
+        ok = (xs >= 0) & (xs < W)
+        covered[xs[ok], path[ok, 1]] = True
+    n_free = int(free.sum())
+    coverage = 100.0 * int((covered & free).sum()) / n_free if n_free else 0.0
+    length = float(np.hypot(*np.diff(path, axis=0).T).sum()) if len(path) > 1 else 0.0
+
+    return {
+        "path": path,
+        "coverage_percent": round(coverage, 2),
+        "path_length": round(length, 2),
+        "cells": len(cells),
+    }
+
+
+class AnytimePlanner:
+    """
+    ARA* (anytime repairing A*) on the same grid/moves as a_star.
+
+    Starts with an inflated heuristic (eps_start) to find a path quickly, then
+    lowers eps by eps_step and repairs the search, reusing everything already
+    expanded. After each pass `path` is the best path so far and `bound` its
+    guaranteed suboptimality factor (cost <= bound * optimal).
+
+    The cost grid is read through a flat float64 memoryview (Python floats on
+    indexing, like a nested list) so setup is one array copy rather than a
+    per-cell tolist(). stop() makes a running or queued refinement return at
+    its next clock check.
+    """
+
+    def __init__(self, grid_cost, start, goal, eps_start=3.0, eps_step=0.5):
+        grid = np.ascontiguousarray(grid_cost, dtype=np.float64)
+        self.max_x, self.max_y = grid.shape
+        self._grid = grid
+        self.cells = memoryview(grid.reshape(-1))
+        self.start = tuple(start)
+        self.goal = tuple(goal)
+        # scale the heuristic by the cheapest cell so it stays admissible
+        self.h_scale = max(0.0, float(grid.min()))
+        self.eps = max(1.0, float(eps_start))
+        self.eps_step = max(0.05, float(eps_step))
+        self.g = {self.start: 0.0}
+        self.parent = {self.start: None}
+        self.open = []
+        self.closed = set()
+        self.incons = set()
+        self.path = None
+        self.cost = None
+        self.bound = float("inf")
+        self.done = False
+        self.running = False
+        self.expansions = 0
+        self.stopped = threading.Event()
+        self.lock = threading.Lock()
+        self._push(self.start)
+
+    def stop(self):
+        self.stopped.set()
+
+    def _expired(self, deadline):
+        return self.stopped.is_set() or (deadline is not None and time.perf_counter() > deadline)
+
+    def _h(self, node):
+        return heuristic(node, self.goal) * self.h_scale
+
+    def _push(self, node):
+        g = self.g[node]
+        heappush(self.open, (g + self.eps * self._h(node), g, node))
+
+    def _improve(self, deadline):
+        """Expand until the goal key is minimal; False if the deadline hit first."""
+        goal = self.goal
+        inf = float("inf")
+        cells, max_y = self.cells, self.max_y
+        while self.open:
+            if (self.expansions & 127) == 0 and self._expired(deadline):
+                return False
+            key, g, s = self.open[0]
+            if self.g.get(goal, inf) <= key:
+                return True
+            heappop(self.open)
+            if s in self.closed or g > self.g[s]:
+                continue  # stale heap entry
+            self.closed.add(s)
+            self.expansions += 1
+            for nb in neighbors(s, self.max_x, self.max_y):
+                ng = g + cells[nb[0] * max_y + nb[1]] * math.hypot(nb[0] - s[0], nb[1] - s[1])
+                if ng < self.g.get(nb, inf):
+                    self.g[nb] = ng
+                    self.parent[nb] = s
+                    if nb in self.closed:
+                        self.incons.add(nb)
+                    else:
+                        self._push(nb)
+        return True
+
+    def _publish(self, deadline=None):
+        if self.goal not in self.g:
+            return
+        path = []
+        node = self.goal
+        while node is not None:
+            path.append(node)
+            node = self.parent[node]
+        path.reverse()
+        g_goal = self.g[self.goal]
+        bound = self.eps
+        # the frontier scan only tightens the bound; eps alone is already valid
+        if not self._expired(deadline):
+            frontier = [self.g[n] + self._h(n) for _, g, n in self.open if n not in self.closed and g == self.g[n]]
+            frontier += [self.g[n] + self._h(n) for n in self.incons]
+            lower = min(frontier) if frontier else g_goal
+            if lower > 0:
+                bound = min(self.eps, g_goal / lower)
+        with self.lock:
+            self.path, self.cost, self.bound = path, g_goal, max(1.0, bound)
+
+    def run(self, deadline=None):
+        """Refine until optimal or until `deadline` (a time.perf_counter() value)."""
+        self.running = True
+        try:
+            self._run(deadline)
+        finally:
+            self.running = False
+
+    def _run(self, deadline):
+        while not self.done:
+            if not self._improve(deadline):
+                return
+            self._publish(deadline)
+            if self.eps <= 1.0 or self.bound <= 1.0:
+                self.done = True
+                return
+            if self._expired(deadline):
+                return  # the next run() repeats the (cheap) publish, then re-keys
+            self.eps = max(1.0, self.eps - self.eps_step)
+            # move INCONS into OPEN, re-key everything for the new eps and reopen CLOSED
+            nodes = {n for _, g, n in self.open if g == self.g[n] and n not in self.closed} | self.incons
+            self.open = [(self.g[n] + self.eps * self._h(n), self.g[n], n) for n in nodes]
+            heapify(self.open)
+            self.incons = set()
+            self.closed = set()
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "path": [[int(x), int(y)] for (x, y) in self.path] if self.path else [],
+                "path_cost": round(self.cost, 3) if self.cost is not None else None,
+                "suboptimality_bound": round(self.bound, 3) if self.path else None,
+                "optimal": self.done,
+                "refining": self.running,
+            }
+
+
+# plan_id -> AnytimePlanner still refining (or finished) in the background
+_plans = OrderedDict()
+_plans_lock = threading.Lock()
+MAX_PLANS = 32
+# refinement is CPU-bound Python and shares the GIL with request threads; keep it to a few
+MAX_REFINERS = max(1, int(os.getenv("MAX_REFINERS", "2")))
+_refiners = ThreadPoolExecutor(max_workers=MAX_REFINERS, thread_name_prefix="ara-refine")
+
+
+def refine_in_background(planner, limit_s=10.0):
+    """
+    Queue `planner` for refinement on the shared refiner pool; returns a
+    plan_id for get_plan(). The limit counts from submission, so a plan that
+    waited in the queue gets less time, and planners evicted from the
+    registry are stopped.
+    """
+    plan_id = uuid.uuid4().hex
+    with _plans_lock:
+        _plans[plan_id] = planner
+        while len(_plans) > MAX_PLANS:
+            _, evicted = _plans.popitem(last=False)
+            evicted.stop()
+    planner.running = True  # visible before a refiner picks it up
+    _refiners.submit(planner.run, time.perf_counter() + limit_s)
+    return plan_id
+
+
+def get_plan(plan_id):
+    with _plans_lock:
+        return _plans.get(plan_id)
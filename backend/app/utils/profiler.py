@@ -0,0 +1,216 @@
+# backend/app/utils/profiler.py
+"""
+Opt-in per-request profiling for live traffic.
+
+Off by default. When enabled (POST /api/admin/profiling, or per request with
+an `X-Profile: 1` header plus the admin token) a sampled fraction of
+requests runs under either cProfile (exact, heavier) or a stack sampler that
+snapshots the request thread every `interval_ms` (cheap, statistical).
+Only the `top_n` slowest profiles per endpoint are kept in memory; cProfile
+runs download as .pstats, sampler runs as collapsed stacks for flamegraph.pl
+or speedscope.
+
+When disabled the request hooks return after a single attribute check.
+"""
+import cProfile
+import heapq
+import hmac
+import itertools
+import marshal
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+from flask import g, request
+
+MODES = ("cprofile", "sampler")
+TOKEN_HEADER = "X-Profile-Token"
+FORCE_HEADER = "X-Profile"
+
+
+def _frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """One background thread sampling the stacks of the threads registered with it."""
+
+    def __init__(self):
+        self.interval_s = 0.005
+        self.targets = {}   # thread ident -> Counter of collapsed stacks
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.thread = None
+
+    def start(self, ident):
+        counts = Counter()
+        with self.lock:
+            self.targets[ident] = counts
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._loop, name="stack-sampler", daemon=True)
+                self.thread.start()
+        self.wake.set()
+        return counts
+
+    def stop(self, ident):
+        with self.lock:
+            return self.targets.pop(ident, Counter())
+
+    def _loop(self):
+        while True:
+            with self.lock:
+                idle = not self.targets
+            if idle:
+                self.wake.wait()
+                self.wake.clear()
+                continue
+            time.sleep(self.interval_s)
+            frames = sys._current_frames()
+            with self.lock:
+                for ident, counts in self.targets.items():
+                    frame = frames.get(ident)
+                    stack = []
+                    while frame is not None:
+                        stack.append(_frame_label(frame.f_code))
+                        frame = frame.f_back
+                    if stack:
+                        counts[";".join(reversed(stack))] += 1
+
+
+class RequestProfiler:
+    def __init__(self):
+        self.enabled = False
+        self.sample_rate = 0.05
+        self.top_n = 5
+        self.mode = "cprofile"
+        self.token = None
+        self.sampler = StackSampler()
+        self.profiles = {}      # endpoint -> min-heap of (duration_ms, seq, record)
+        self.lock = threading.Lock()
+        self._seq = itertools.count(1)
+
+    def init_app(self, app):
+        # no token configured -> profiling cannot be switched on at all
+        self.token = os.getenv("PROFILER_TOKEN") or None
+        app.before_request(self._before)
+        app.teardown_request(self._after)
+
+    def is_admin(self, req):
+        supplied = req.headers.get(TOKEN_HEADER, "")
+        return self.token is not None and hmac.compare_digest(supplied, self.token)
+
+    def configure(self, enabled=None, sample_rate=None, top_n=None, mode=None, interval_ms=None):
+        if mode is not None and mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}")
+        if sample_rate is not None and not 0.0 <= float(sample_rate) <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+        if top_n is not None and int(top_n) < 1:
+            raise ValueError("top_n must be >= 1")
+        if interval_ms is not None and float(interval_ms) < 1:
+            raise ValueError("interval_ms must be >= 1")
+        if sample_rate is not None:
+            self.sample_rate = float(sample_rate)
+        if top_n is not None:
+            self.top_n = int(top_n)
+            with self.lock:
+                for key, heap in self.profiles.items():
+                    self.profiles[key] = heapq.nlargest(self.top_n, heap)
+                    heapq.heapify(self.profiles[key])
+        if mode is not None:
+            self.mode = mode
+        if interval_ms is not None:
+            self.sampler.interval_s = float(interval_ms) / 1000.0
+        if enabled is not None:
+            self.enabled = bool(enabled)
+
+    # --- request hooks ---
+
+    def _before(self):
+        if not self.enabled and FORCE_HEADER not in request.headers:
+            return
+        forced = request.headers.get(FORCE_HEADER) == "1" and self.is_admin(request)
+        if not forced and not (self.enabled and random.random() < self.sample_rate):
+            return
+        if request.path.startswith("/api/admin/profiling"):
+            return
+        mode = self.mode
+        if mode == "cprofile":
+            prof = cProfile.Profile()
+            try:
+                prof.enable()
+            except ValueError:  # another profiler is active in this process (3.12+)
+                return
+            g._profile = (mode, prof, time.perf_counter())
+        else:
+            ident = threading.get_ident()
+            self.sampler.start(ident)
+            g._profile = (mode, ident, time.perf_counter())
+
+    def _after(self, exc=None):
+        state = g.pop("_profile", None)
+        if state is None:
+            return
+        mode, handle, t0 = state
+        duration_ms = (time.perf_counter() - t0) * 1000.0
+        if mode == "cprofile":
+            handle.disable()
+            handle.create_stats()
+            data = marshal.dumps(handle.stats)   # same bytes pstats.dump_stats writes
+        else:
+            counts = self.sampler.stop(handle)
+            data = "".join(f"{stack} {n}\n" for stack, n in counts.most_common()).encode()
+
+        # one bucket for every 404/405 so arbitrary URLs (or methods) cannot grow the store
+        endpoint = f"{request.method} {request.url_rule.rule}" if request.url_rule is not None else "<unmatched>"
+        record = {
+            "id": next(self._seq),
+            "endpoint": endpoint,
+            "path": request.path,
+            "mode": mode,
+            "duration_ms": round(duration_ms, 2),
+            "timestamp": time.time(),
+            "data": data,
+        }
+        with self.lock:
+            heap = self.profiles.setdefault(endpoint, [])
+            entry = (duration_ms, record["id"], record)
+            if len(heap) < self.top_n:
+                heapq.heappush(heap, entry)
+            elif duration_ms > heap[0][0]:
+                heapq.heapreplace(heap, entry)
+
+    # --- access ---
+
+    def status(self):
+        with self.lock:
+            endpoints = {
+                key: [{k: v for k, v in rec.items() if k != "data"}
+                      for _, _, rec in sorted(heap, reverse=True)]
+                for key, heap in self.profiles.items()
+            }
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "top_n": self.top_n,
+            "mode": self.mode,
+            "interval_ms": self.sampler.interval_s * 1000.0,
+            "endpoints": endpoints,
+        }
+
+    def get(self, profile_id):
+        with self.lock:
+            for heap in self.profiles.values():
+                for _, seq, rec in heap:
+                    if seq == profile_id:
+                        return rec
+        return None
+
+    def clear(self):
+        with self.lock:
+            self.profiles.clear()
+
+
+profiler = RequestProfiler()
@@ -0,0 +1,170 @@
+# backend/app/utils/risk_grid.py
+"""
+Per-mission Bayesian risk grid fed by geotagged /predict/mine probabilities.
+
+The grid stores log-odds of "mine present" per cell. Each reading adds its
+evidence logit(p) - logit(prior), spread over nearby cells with a Gaussian
+weight, and old evidence decays back towards the prior with a half-life.
+Grids are [x][y] indexed like the planner's cost map.
+
+Decay is lazy: the grid holds the deviation from the prior at a reference
+time, and the log-odds at time t are l0 + dev * 0.5 ** ((t - ref_t) / half_life).
+An update only touches its footprint cells (evidence is divided by the
+current scale); the grid is rebased in one pass once the scale gets small.
+"""
+import os
+import threading
+import time
+
+import numpy as np
+
+from app.utils.path_planning import obstacle_cost
+
+
+def _logit(p):
+    p = np.clip(p, 1e-4, 1 - 1e-4)
+    return np.log(p / (1 - p))
+
+
+# rebase once the decay scale drops below this (~10 half-lives) to keep float32 dev well-conditioned
+REBASE_SCALE = 1e-3
+
+
+class RiskGrid:
+    def __init__(self, width, height, prior=0.05, sigma=1.5, half_life_s=600.0, clamp=12.0):
+        self.width = int(width)
+        self.height = int(height)
+        self.prior = float(prior)
+        self.sigma = float(sigma)
+        self.half_life_s = float(half_life_s) if half_life_s else None
+        self.clamp = float(clamp)
+        self.l0 = float(_logit(self.prior))
+        self.dev = np.zeros((self.width, self.height), dtype=np.float32)
+        self.updated_at = self.ref_t = time.time()
+        self.n_readings = 0
+        self.lock = threading.Lock()
+
+        # Gaussian footprint offsets out to 3 sigma
+        r = max(0, int(np.ceil(3 * self.sigma)))
+        ox, oy = np.meshgrid(np.arange(-r, r + 1), np.arange(-r, r + 1), indexing="ij")
+        self._ox = ox.ravel()
+        self._oy = oy.ravel()
+
+    def _scale(self, now):
+        """Decay factor for dev at `now`; the clock never runs backwards past updated_at."""
+        if self.half_life_s is None:
+            return 1.0
+        return 0.5 ** ((max(now, self.updated_at) - self.ref_t) / self.half_life_s)
+
+    def _rebase(self, now):
+        scale = self._scale(now)
+        if scale < REBASE_SCALE:
+            self.dev *= np.float32(scale)
+            self.ref_t = max(now, self.updated_at)
+
+    def _log_odds(self, now):
+        return self.l0 + self.dev * np.float32(self._scale(now))
+
+    def update(self, xs, ys, probs, now=None):
+        """Fuse a batch of readings at (xs, ys) cell coordinates with probabilities probs."""
+        xs = np.asarray(xs, dtype=np.float64).ravel()
+        ys = np.asarray(ys, dtype=np.float64).ravel()
+        probs = np.asarray(probs, dtype=np.float64).ravel()
+        if not (len(xs) == len(ys) == len(probs)):
+            raise ValueError("x, y and probability must have the same length")
+        # one NaN would spread over the footprint and never decay away
+        if not (np.isfinite(xs).all() and np.isfinite(ys).all() and np.isfinite(probs).all()):
+            raise ValueError("x, y and probability must be finite numbers")
+        evidence = _logit(probs) - self.l0
+        now = time.time() if now is None else float(now)
+
+        cx = np.rint(xs).astype(np.int64)[:, None] + self._ox[None, :]
+        cy = np.rint(ys).astype(np.int64)[:, None] + self._oy[None, :]
+        d2 = (cx - xs[:, None]) ** 2 + (cy - ys[:, None]) ** 2
+        w = np.exp(-d2 / (2 * self.sigma ** 2)) if self.sigma > 0 else (d2 == 0).astype(np.float64)
+        ok = (cx >= 0) & (cx < self.width) & (cy >= 0) & (cy < self.height)
+        flat = cx[ok] * self.height + cy[ok]
+        weights = (w * evidence[:, None])[ok]
+
+        with self.lock:
+            self._rebase(now)
+            scale = self._scale(now)
+            dev = self.dev.reshape(-1)
+            np.add.at(dev, flat, weights / scale)
+            # untouched cells only relax towards the prior, so clamping the footprint is enough
+            cells = np.unique(flat)
+            dev[cells] = np.clip(dev[cells], (-self.clamp - self.l0) / scale, (self.clamp - self.l0) / scale)
+            self.updated_at = max(now, self.updated_at)
+            self.n_readings += len(xs)
+
+    def probability(self, now=None):
+        now = time.time() if now is None else float(now)
+        with self.lock:
+            lo = self._log_odds(now)
+        return 1.0 / (1.0 + np.exp(-lo))
+
+    def cost_map(self, obstacle_threshold=0.75):
+        """
+        Planner cost map on the same scale as build_cost_map: 1 + 5 * p, so
+        p above obstacle_threshold crosses obstacle_cost() and is made x10.
+        """
+        cost = 1.0 + 5.0 * self.probability().astype(np.float64)
+        cost[cost > obstacle_cost(obstacle_threshold)] *= 10.0
+        return cost
+
+    def summary(self):
+        p = self.probability()
+        return {
+            "grid_size": [self.width, self.height],
+            "prior": self.prior,
+            "sigma": self.sigma,
+            "half_life_s": self.half_life_s,
+            "n_readings": self.n_readings,
+            "max_probability": round(float(p.max()), 4),
+            "cells_above_0_5": int((p > 0.5).sum()),
+        }
+
+    def save(self, path):
+        with self.lock:
+            np.savez(path, log_odds=self._log_odds(self.updated_at),
+                     params=np.array([self.prior, self.sigma, self.half_life_s or 0.0, self.clamp,
+                                      self.updated_at, self.n_readings]))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as f:
+            prior, sigma, half_life_s, clamp, updated_at, n_readings = f["params"].tolist()
+            lo = f["log_odds"]
+            grid = cls(lo.shape[0], lo.shape[1], prior, sigma, half_life_s or None, clamp)
+            grid.dev[...] = lo - grid.l0
+        grid.updated_at = grid.ref_t = updated_at
+        grid.n_readings = int(n_readings)
+        return grid
+
+
+# mission_id -> RiskGrid for this process; snapshots under RISK_GRID_DIR survive restarts
+_grids = {}
+_grids_lock = threading.Lock()
+MAX_GRIDS = int(os.getenv("MAX_RISK_GRIDS", "64"))
+
+
+def snapshot_path(base_dir, mission_id):
+    return os.path.join(base_dir, f"{mission_id}.npz")
+
+
+def get_grid(mission_id, base_dir=None):
+    with _grids_lock:
+        grid = _grids.get(mission_id)
+        if grid is None and base_dir and os.path.exists(snapshot_path(base_dir, mission_id)):
+            grid = _grids[mission_id] = RiskGrid.load(snapshot_path(base_dir, mission_id))
+        return grid
+
+
+def create_grid(mission_id, **kwargs):
+    """Create or reset a mission grid; ValueError once MAX_GRIDS missions are in memory."""
+    grid = RiskGrid(**kwargs)
+    with _grids_lock:
+        if mission_id not in _grids and len(_grids) >= MAX_GRIDS:
+            raise ValueError(f"Mission limit reached ({MAX_GRIDS} grids in memory)")
+        _grids[mission_id] = grid
+    return grid
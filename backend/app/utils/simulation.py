@@ -0,0 +1,138 @@
+# backend/app/utils/simulation.py
+"""
+Monte Carlo minefield trials: random layout -> emulated sensor sweep ->
+batch scoring with the detection pipeline -> risk-grid planning -> metrics.
+
+Each trial gets its own child of one SeedSequence, so a report depends only
+on (seed, config) and not on the number of worker processes.
+"""
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from app.utils.features import derive_features
+from app.utils.path_planning import a_star, random_mines
+from app.utils.risk_grid import RiskGrid
+
+# Per-class (mean, std) of Metal_Level, Magnetic_Field, Ground_Density,
+# Thermal_Signature in datasets/mine_detection_dataset.csv
+SENSOR_PROFILES = {
+    0: (np.array([0.486, 0.344, 0.386, 0.350]), np.array([0.211, 0.234, 0.195, 0.189])),
+    1: (np.array([0.703, 0.624, 0.398, 0.532]), np.array([0.201, 0.242, 0.194, 0.212])),
+}
+
+DEFAULT_CONFIG = {
+    "width": 40,
+    "height": 30,
+    "mines": 6,
+    "signal_radius": 1.0,   # cells around a mine centre that read as "mine present"
+    "threshold": 0.5,       # detection threshold on the model probability
+    "obstacle_threshold": 0.75,
+}
+
+
+def emulate_readings(mine_mask, rng):
+    """One raw 4-channel reading per cell, drawn from the class profile of that cell."""
+    flat = mine_mask.ravel()
+    raw = np.empty((flat.size, 4))
+    for cls, (mean, std) in SENSOR_PROFILES.items():
+        idx = np.flatnonzero(flat == cls)
+        raw[idx] = rng.normal(mean, std, size=(idx.size, 4))
+    return np.clip(raw, 0.0, 1.0)
+
+
+def run_trial(seed_seq, config, pipeline):
+    W, H = config["width"], config["height"]
+    rng = np.random.default_rng(seed_seq)
+    mines = random_mines(W, H, random.Random(int(seed_seq.generate_state(1)[0])), count=config["mines"])
+
+    xs, ys = np.meshgrid(np.arange(W), np.arange(H), indexing="ij")
+    signal = np.zeros((W, H), dtype=bool)
+    hazard = np.zeros((W, H), dtype=bool)
+    per_mine = []
+    for m in mines:
+        dist = np.hypot(xs - m["x"], ys - m["y"])
+        footprint = dist <= config["signal_radius"]
+        signal |= footprint
+        hazard |= dist <= m["radius"]
+        per_mine.append(footprint)
+
+    proba = pipeline.predict_proba(derive_features(emulate_readings(signal.astype(int), rng)))[:, 1]
+    proba = proba.reshape(W, H)
+    detected = proba >= config["threshold"]
+
+    grid = RiskGrid(W, H, sigma=1.0, half_life_s=None)
+    grid.update(xs.ravel(), ys.ravel(), proba.ravel())
+    path = a_star(grid.cost_map(config["obstacle_threshold"]).tolist(), (0, 0), (W - 1, H - 1)) or []
+    path_arr = np.array(path, dtype=np.int64).reshape(-1, 2)
+    on_path = np.zeros((W, H), dtype=bool)
+    on_path[path_arr[:, 0], path_arr[:, 1]] = True
+
+    n_clear = int((~signal).sum())
+    return {
+        "detection_rate": float(np.mean([(detected & fp).any() for fp in per_mine])) if mines else 1.0,
+        "false_alarms": int((detected & ~signal).sum()),
+        "false_alarm_rate": float((detected & ~signal).sum() / n_clear) if n_clear else 0.0,
+        "path_length": float(sum(math.hypot(b[0] - a[0], b[1] - a[1]) for a, b in zip(path, path[1:]))),
+        "path_hazard_cells": int((on_path & hazard).sum()),
+        "mine_strike": bool((on_path & signal).any()),
+    }
+
+
+_worker_pipeline = None
+
+
+def _init_worker(pipe_path):
+    global _worker_pipeline
+    import joblib
+    _worker_pipeline = joblib.load(pipe_path)
+
+
+def _run_worker(args):
+    seed_seq, config = args
+    return run_trial(seed_seq, config, _worker_pipeline)
+
+
+def _aggregate(results):
+    report = {}
+    for key in results[0]:
+        vals = np.array([r[key] for r in results], dtype=float)
+        if key == "mine_strike":
+            report["mine_strike_rate"] = round(float(vals.mean()), 4)
+            continue
+        p5, p50, p95 = np.percentile(vals, [5, 50, 95])
+        report[key] = {"mean": round(float(vals.mean()), 4), "std": round(float(vals.std()), 4),
+                       "p5": round(float(p5), 4), "p50": round(float(p50), 4), "p95": round(float(p95), 4)}
+    return report
+
+
+def run_simulation(pipe_path, trials=200, seed=0, workers=None, pipeline=None, **overrides):
+    """
+    Aggregate metrics over `trials` seeded trials. With workers <= 1 the
+    trials run in-process on `pipeline` (loaded from pipe_path if None);
+    otherwise each worker process loads pipe_path once.
+    """
+    config = {**DEFAULT_CONFIG, **{k: v for k, v in overrides.items() if v is not None}}
+    seeds = np.random.SeedSequence(seed).spawn(int(trials))
+    jobs = [(s, config) for s in seeds]
+    workers = workers or min(4, os.cpu_count() or 1)
+
+    if workers <= 1:
+        if pipeline is None:
+            import joblib
+            pipeline = joblib.load(pipe_path)
+        results = [run_trial(s, c, pipeline) for s, c in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(pipe_path,)) as pool:
+            results = list(pool.map(_run_worker, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+
+    return {
+        "trials": int(trials),
+        "seed": int(seed),
+        "workers": int(workers),
+        "config": config,
+        "metrics": _aggregate(results),
+    }
@@ -0,0 +1,42 @@
+# backend/app/utils/startup.py
+"""
+Boot-time bookkeeping: named stage timings (imports, model loads, warm-up)
+and the readiness flag served by /ready.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupProfile:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = []
+        self.ready = threading.Event()
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.stages.append({
+                    "stage": name,
+                    "start_ms": round((t0 - self.started) * 1000.0, 1),
+                    "ms": round((time.perf_counter() - t0) * 1000.0, 1),
+                    "thread": threading.current_thread().name,
+                })
+
+    def report(self):
+        with self.lock:
+            stages = list(self.stages)
+        return {
+            "ready": self.ready.is_set(),
+            "stages": stages,
+            "total_ms": round(sum(s["ms"] for s in stages), 1),
+        }
+
+
+profile = StartupProfile()
@@ -0,0 +1,108 @@
+# backend/gpr_tiles.py
+"""
+Heatmap tile pyramids for GPR B-scans, shared by the API (/api/gpr/tiles)
+and tools/gpr_preprocess.py. Pure NumPy and standard library, kept outside
+the app package so the offline script does not pull in Flask or the database.
+"""
+import json
+import struct
+import zlib
+import numpy as np
+
+TILE_MAGIC = b"GPRTILE1"
+TILE_SIZE = 256
+
+
+def normalize_uint8(data: np.ndarray):
+    # same 1-99 percentile clipping as the offline heatmap, quantized once
+    vmin, vmax = np.percentile(data, [1, 99])
+    scale = 255.0 / max(float(vmax - vmin), 1e-12)
+    q = np.clip((data - vmin) * scale, 0, 255)
+    return np.rint(q).astype(np.uint8), float(vmin), float(vmax)
+
+
+def _halve(img: np.ndarray) -> np.ndarray:
+    # 2x2 mean, odd edges padded by repetition
+    h, w = img.shape
+    if h % 2 or w % 2:
+        img = np.pad(img, ((0, h % 2), (0, w % 2)), mode="edge")
+    s = img.astype(np.uint16)
+    s = s[0::2, 0::2] + s[1::2, 0::2] + s[0::2, 1::2] + s[1::2, 1::2]
+    return ((s + 2) >> 2).astype(np.uint8)
+
+
+def build_tile_pyramid(data: np.ndarray, path, tile_size=TILE_SIZE) -> dict:
+    """
+    Write a power-of-two pyramid of the normalized B-scan to a single file:
+    magic, uint32 header length, JSON header, then every level as raw uint8,
+    each aligned to 64 bytes. Images are depth rows x trace columns, so
+    tile x runs along the traces and tile y down in depth.
+    Zoom 0 is the coarsest level (fits in one tile), the last zoom is full resolution.
+    """
+    img, vmin, vmax = normalize_uint8(np.asarray(data).T)
+    levels = [np.ascontiguousarray(img)]
+    while max(levels[-1].shape) > tile_size:
+        levels.append(_halve(levels[-1]))
+    levels.reverse()
+
+    meta = {"tile_size": int(tile_size), "vmin": vmin, "vmax": vmax,
+            "max_zoom": len(levels) - 1, "levels": []}
+    # offsets depend on the header length, so size the header with placeholders first
+    for z, lvl in enumerate(levels):
+        meta["levels"].append({"zoom": z, "height": int(lvl.shape[0]), "width": int(lvl.shape[1]),
+                               "offset": 0})
+    header_room = len(json.dumps(meta)) + 32 * len(levels) + 64
+    offset = -(-(len(TILE_MAGIC) + 4 + header_room) // 64) * 64
+    for entry, lvl in zip(meta["levels"], levels):
+        entry["offset"] = offset
+        offset += -(-lvl.size // 64) * 64
+    header = json.dumps(meta).encode().ljust(header_room)
+
+    with open(path, "wb") as f:
+        f.write(TILE_MAGIC + struct.pack("<I", len(header)) + header)
+        for entry, lvl in zip(meta["levels"], levels):
+            f.seek(entry["offset"])
+            f.write(lvl.tobytes())
+        f.truncate(offset)
+    return meta
+
+
+class TilePyramid:
+    """Read-only, memory-mapped view of a file written by build_tile_pyramid."""
+
+    def __init__(self, path):
+        self.buf = np.memmap(path, dtype=np.uint8, mode="r")
+        if self.buf[:len(TILE_MAGIC)].tobytes() != TILE_MAGIC:
+            raise ValueError("Not a GPR tile pyramid")
+        start = len(TILE_MAGIC) + 4
+        (header_len,) = struct.unpack("<I", self.buf[len(TILE_MAGIC):start].tobytes())
+        self.meta = json.loads(self.buf[start:start + header_len].tobytes())
+        self.tile_size = self.meta["tile_size"]
+        self.levels = [
+            self.buf[e["offset"]:e["offset"] + e["height"] * e["width"]].reshape(e["height"], e["width"])
+            for e in self.meta["levels"]
+        ]
+
+    def tile(self, z: int, x: int, y: int) -> np.ndarray:
+        if not 0 <= z < len(self.levels):
+            raise IndexError(f"zoom must be in [0, {len(self.levels) - 1}]")
+        lvl = self.levels[z]
+        ts = self.tile_size
+        if x < 0 or y < 0 or y * ts >= lvl.shape[0] or x * ts >= lvl.shape[1]:
+            raise IndexError("tile outside the scan")
+        return lvl[y * ts:(y + 1) * ts, x * ts:(x + 1) * ts]
+
+
+def encode_png_gray(img: np.ndarray) -> bytes:
+    # minimal 8-bit greyscale PNG; the colormap is applied client-side
+    h, w = img.shape
+    raw = np.zeros((h, w + 1), dtype=np.uint8)
+    raw[:, 1:] = img
+
+    def chunk(tag, payload):
+        return struct.pack(">I", len(payload)) + tag + payload + struct.pack(">I", zlib.crc32(tag + payload) & 0xFFFFFFFF)
+
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", w, h, 8, 0, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw.tobytes(), 6))
+            + chunk(b"IEND", b""))
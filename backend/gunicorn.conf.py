@@ -0,0 +1,7 @@
+# backend/gunicorn.conf.py — picked up automatically by `gunicorn main:app`
+import os
+
+# Load the app (and warm the models) once in the master before forking, so
+# every worker starts with the model stack already imported and in memory.
+preload_app = True
+os.environ.setdefault("WARMUP_MODE", "eager")
@@ -0,0 +1,6 @@
+# backend/tests/conftest.py
+import os
+import sys
+
+# run from backend/ or the repo root: make `app` and `gpr_tiles` importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,54 @@
+# backend/tests/test_encoding.py
+import numpy as np
+import pytest
+
+from app.utils.encoding import decode_cost_map, decode_path, encode_cost_map, encode_path
+
+
+@pytest.mark.parametrize("path", [
+    [[3, 4]],
+    [[0, 0], [1, 1], [2, 2], [3, 2], [4, 2], [4, 1], [3, 0], [2, 0], [1, 1], [0, 2]],
+    [[5, 5], [4, 5], [3, 4], [3, 3], [3, 2], [4, 1], [5, 0], [6, 1], [7, 2]],
+])
+def test_path_round_trip(path):
+    encoded = encode_path(path)
+    assert decode_path(encoded) == path
+    assert encoded["length"] == len(path)
+
+
+def test_path_round_trip_random_walk():
+    rng = np.random.default_rng(0)
+    steps = rng.integers(-1, 2, size=(500, 2))
+    steps = steps[np.abs(steps).sum(axis=1) > 0]
+    path = np.concatenate([[[100, 100]], 100 + np.cumsum(steps, axis=0)]).tolist()
+    encoded = encode_path(path)
+    assert decode_path(encoded) == path
+    assert sum(count for _, count in encoded["runs"]) == len(path) - 1
+
+
+def test_path_repeated_cells_are_dropped():
+    assert decode_path(encode_path([[1, 1], [1, 1], [2, 1]])) == [[1, 1], [2, 1]]
+
+
+def test_empty_path():
+    assert decode_path(encode_path([])) == []
+
+
+def test_non_adjacent_path_is_rejected():
+    with pytest.raises(ValueError):
+        encode_path([[0, 0], [2, 0]])
+
+
+def test_cost_map_keeps_block_maximum():
+    grid = np.ones((10, 6))
+    grid[7, 4] = 60.0
+    enc = encode_cost_map(grid, max_side=5)
+    assert enc["block"] == 2 and enc["shape"] == [5, 3]
+    values = decode_cost_map(enc)
+    assert values[3, 2] == pytest.approx(60.0)
+    assert values.min() == pytest.approx(1.0)
+
+
+def test_cost_map_rejects_non_positive_side():
+    with pytest.raises(ValueError):
+        encode_cost_map(np.ones((4, 4)), max_side=0)
@@ -0,0 +1,85 @@
+# backend/tests/test_features.py
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.utils.features import FEATURES, RATIO_EPS, RAW_CHANNELS, derive_features, prepare_features
+
+DATASET = os.path.join(os.path.dirname(__file__), "..", "app", "models", "mine_detection_dataset.csv")
+
+
+def training_math(df):
+    # the derived columns exactly as the training notebook builds them
+    df = df.copy()
+    df["Metal_Mag_Ratio"] = df["Metal_Level"] / (df["Magnetic_Field"] + 1e-6)
+    df["Metal_Diff"] = df["Metal_Level"] - df["Magnetic_Field"]
+    df["Metal_Mag_Energy"] = np.sqrt(df["Metal_Level"] ** 2 + df["Magnetic_Field"] ** 2)
+    df["Metal_Mag_Avg"] = (df["Metal_Level"] + df["Magnetic_Field"]) / 2
+    return df[FEATURES].to_numpy()
+
+
+def test_derive_features_is_bit_identical_to_training_math():
+    df = pd.read_csv(DATASET, usecols=RAW_CHANNELS)[RAW_CHANNELS]
+    out = derive_features(df.to_numpy())
+    assert out.dtype == np.float64
+    np.testing.assert_array_equal(out, training_math(df))
+
+
+def test_random_rows_are_bit_identical():
+    rng = np.random.default_rng(0)
+    raw = rng.uniform(-2, 2, size=(10000, 4))
+    df = pd.DataFrame(raw, columns=RAW_CHANNELS)
+    np.testing.assert_array_equal(derive_features(raw), training_math(df))
+
+
+def test_zero_denominator_maps_to_the_mf_zero_value():
+    raw = np.array([[0.5, -RATIO_EPS, 0.3, 0.2],
+                    [0.5, 0.0, 0.3, 0.2]])
+    out = derive_features(raw)
+    assert np.isfinite(out).all()
+    assert out[0, FEATURES.index("Metal_Mag_Ratio")] == out[1, FEATURES.index("Metal_Mag_Ratio")] == 0.5 / RATIO_EPS
+
+
+def test_raw_and_full_rows_prepare_identically():
+    full = derive_features(np.array([[0.65, 0.22, 0.45, 0.33], [0.1, 0.9, 0.5, 0.5]]))
+    np.testing.assert_array_equal(prepare_features(full[:, :4].tolist()), full)
+    np.testing.assert_array_equal(prepare_features(full.tolist()), full)
+    np.testing.assert_array_equal(prepare_features(full[0, :4].tolist()), full[:1])
+
+
+def test_float32_full_rows_keep_their_dtype():
+    X = np.ones((3, len(FEATURES)), dtype=np.float32)
+    assert prepare_features(X).dtype == np.float32
+
+
+@pytest.mark.parametrize("bad", [[], [[]], [1.0, 2.0, 3.0], [[1.0] * 5], np.ones((2, 2, 4))])
+def test_prepare_features_rejects_other_shapes(bad):
+    with pytest.raises(ValueError):
+        prepare_features(bad)
+
+
+@pytest.fixture(scope="module")
+def client():
+    os.environ.setdefault("ENABLE_SWAGGER", "0")
+    os.environ.setdefault("WARMUP_MODE", "lazy")
+    from app import create_app
+    from app.routes.predict_routes import get_pipeline
+    if get_pipeline() is None:
+        pytest.skip("mine detection pipeline is not available")
+    return create_app().test_client()
+
+
+def test_predict_mine_raw_and_full_inputs_give_the_same_response(client):
+    df = pd.read_csv(DATASET, usecols=RAW_CHANNELS, nrows=200)[RAW_CHANNELS]
+    raw = df.to_numpy()
+    full = training_math(df)
+    r_raw = client.post("/api/predict/mine", json={"input": raw.tolist()})
+    r_full = client.post("/api/predict/mine", json={"input": full.tolist()})
+    assert r_raw.status_code == r_full.status_code == 200
+    assert r_raw.get_json() == r_full.get_json()
+
+    one_raw = client.post("/api/predict/mine", json={"input": raw[0].tolist()})
+    one_full = client.post("/api/predict/mine", json={"input": full[0].tolist()})
+    assert one_raw.get_json() == one_full.get_json()
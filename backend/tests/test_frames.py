@@ -0,0 +1,82 @@
+# backend/tests/test_frames.py
+import numpy as np
+import pytest
+
+try:
+    import msgpack
+except ImportError:  # optional dependency, like in app/utils/frames.py
+    msgpack = None
+
+from app.utils.frames import (FRAME_MAGIC, HEADER, RESULT_MAGIC, VERSION, FrameError, decode_frames,
+                              decode_msgpack_frames, encode_results)
+
+
+def frame(rows, cols=8, layout=0, magic=FRAME_MAGIC, version=VERSION, data=None):
+    if data is None:
+        data = np.arange(rows * cols, dtype="<f4").tobytes()
+    return HEADER.pack(magic, version, layout, cols, rows) + data
+
+
+def test_decode_frames_round_trip():
+    layout, X = decode_frames(frame(3, cols=4, layout=1))
+    assert layout == 1
+    assert X.shape == (3, 4) and X.dtype == np.float32
+    assert X[2, 3] == 11.0
+
+
+@pytest.mark.parametrize("body", [
+    b"",
+    b"IMF1",                                            # shorter than the header
+    frame(2, magic=b"XXXX"),                            # bad magic
+    frame(2, version=VERSION + 1),                      # unknown version
+    frame(2, layout=9),                                 # unknown layout
+    frame(2, cols=5, layout=0, data=b"\0" * 40),        # columns do not match the layout
+    frame(2)[:-1],                                      # truncated data
+    frame(2) + b"\0\0\0\0",                             # trailing bytes
+    frame(0),                                           # no rows
+])
+def test_decode_frames_rejects_bad_input(body):
+    with pytest.raises(FrameError):
+        decode_frames(body)
+
+
+def test_encode_results_layout():
+    body = encode_results(np.array([1, 0]), np.array([0.9, 0.2]))
+    magic, version, _, _, rows = HEADER.unpack_from(body)
+    assert (magic, version, rows) == (RESULT_MAGIC, VERSION, 2)
+    proba = np.frombuffer(body, dtype="<f4", count=2, offset=HEADER.size)
+    pred = np.frombuffer(body, dtype=np.uint8, offset=HEADER.size + 8)
+    assert proba == pytest.approx([0.9, 0.2]) and pred.tolist() == [1, 0]
+
+
+@pytest.mark.skipif(msgpack is None, reason="msgpack is not installed")
+class TestMsgpack:
+    def pack(self, **fields):
+        msg = {"layout": 0, "rows": 2, "cols": 8, "data": np.ones(16, dtype="<f4").tobytes()}
+        msg.update(fields)
+        return msgpack.packb(msg)
+
+    def test_round_trip(self):
+        layout, X = decode_msgpack_frames(self.pack())
+        assert layout == 0 and X.shape == (2, 8)
+
+    @pytest.mark.parametrize("body", [
+        b"\xc1",                                        # never-used msgpack type byte
+        b"\x81",                                        # truncated map
+        b"\x80\x80",                                    # extra data after the message
+        b"\x93\x01\x02\x03",                            # an array, not a map
+    ])
+    def test_rejects_malformed_bodies(self, body):
+        with pytest.raises(FrameError):
+            decode_msgpack_frames(body)
+
+    @pytest.mark.parametrize("fields", [
+        {"data": "not bytes"},
+        {"rows": 0, "data": b""},
+        {"rows": 3},
+        {"layout": 7},
+        {"cols": "eight"},
+    ])
+    def test_rejects_bad_fields(self, fields):
+        with pytest.raises(FrameError):
+            decode_msgpack_frames(self.pack(**fields))
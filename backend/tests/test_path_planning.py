@@ -0,0 +1,103 @@
+# backend/tests/test_path_planning.py
+import math
+import random
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+
+from app.utils import path_planning
+from app.utils.path_planning import (AnytimePlanner, a_star, build_cost_map, coverage_path, obstacle_cost,
+                                     random_mines, refine_in_background)
+
+THRESHOLD = 0.75
+
+
+def field(seed, W=48, H=36, count=8):
+    mines = random_mines(W, H, random.Random(seed), count=count)
+    grid, _ = build_cost_map(W, H, mines, THRESHOLD)
+    return grid
+
+
+def path_cost(grid, path):
+    return sum(grid[b[0]][b[1]] * math.hypot(b[0] - a[0], b[1] - a[1]) for a, b in zip(path, path[1:]))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_ara_star_converges_to_a_star_cost(seed):
+    grid = field(seed)
+    W, H = grid.shape
+    start, goal = (0, 0), (W - 1, H - 1)
+    planner = AnytimePlanner(grid, start, goal, eps_start=3.0)
+    planner.run()
+    optimal = path_cost(grid, a_star(grid.tolist(), start, goal))
+
+    assert planner.done and planner.bound == 1.0
+    assert planner.cost == pytest.approx(optimal)
+    assert planner.path[0] == start and planner.path[-1] == goal
+    assert path_cost(grid, planner.path) == pytest.approx(planner.cost)
+
+
+def test_ara_star_first_pass_respects_its_bound():
+    grid = field(7)
+    W, H = grid.shape
+    optimal = path_cost(grid, a_star(grid.tolist(), (0, 0), (W - 1, H - 1)))
+    planner = AnytimePlanner(grid, (0, 0), (W - 1, H - 1), eps_start=5.0)
+    planner._improve(None)
+    planner._publish()
+    assert 1.0 <= planner.bound <= 5.0
+    assert planner.cost <= planner.bound * optimal + 1e-9
+
+
+def test_expired_deadline_leaves_no_path():
+    planner = AnytimePlanner(field(1), (0, 0), (47, 35))
+    planner.run(deadline=0.0)
+    assert planner.path is None and not planner.done
+    assert planner.snapshot()["path"] == []
+
+
+def test_evicted_plans_are_stopped(monkeypatch):
+    monkeypatch.setattr(path_planning, "MAX_PLANS", 2)
+    monkeypatch.setattr(path_planning, "_plans", OrderedDict())
+    planners = [AnytimePlanner(field(0), (0, 0), (47, 35)) for _ in range(4)]
+    for p in planners:
+        refine_in_background(p)
+    assert [p.stopped.is_set() for p in planners] == [True, True, False, False]
+    assert len(path_planning._plans) == 2
+
+
+def check_coverage(grid, lane_spacing):
+    blocked = grid > obstacle_cost(THRESHOLD)
+    result = coverage_path(grid, (0, 0), lane_spacing, obstacle_cost(THRESHOLD))
+    path = result["path"]
+    steps = np.abs(np.diff(path, axis=0))
+    assert steps.max() == 1  # 8-connected: no jumps
+    assert (steps.sum(axis=1) > 0).all()  # and no repeated cells
+    assert not blocked[path[:, 0], path[:, 1]].any()
+    return result
+
+
+@pytest.mark.parametrize("seed,lane_spacing", [(s, ls) for s in range(4) for ls in (1, 2, 3)])
+def test_coverage_path_is_adjacent_and_avoids_blocked_cells(seed, lane_spacing):
+    grid = field(seed, count=10)
+    assert (grid > obstacle_cost(THRESHOLD)).any()
+    result = check_coverage(grid, lane_spacing)
+    if lane_spacing == 1:
+        assert result["coverage_percent"] == 100.0
+
+
+def test_coverage_transit_goes_around_a_long_wall():
+    # crossing the wall is cheaper than the detour through the far gap, but it is blocked
+    grid = np.ones((30, 200))
+    grid[15, :199] = 48.0
+    grid[5:25, 100] = 48.0
+    result = check_coverage(grid, 1)
+    assert result["coverage_percent"] == 100.0
+
+
+def test_coverage_path_without_obstacles_sweeps_every_cell():
+    grid = np.ones((10, 7))
+    result = coverage_path(grid, (0, 0))
+    assert result["cells"] == 1
+    assert len(result["path"]) == grid.size
+    assert {tuple(p) for p in result["path"].tolist()} == {(x, y) for x in range(10) for y in range(7)}
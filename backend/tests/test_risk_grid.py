@@ -0,0 +1,108 @@
+# backend/tests/test_risk_grid.py
+import numpy as np
+import pytest
+
+from app.utils.risk_grid import REBASE_SCALE, RiskGrid, _logit
+
+
+class EagerGrid:
+    """Reference model: decay every cell on every call, add the footprint, clamp the whole grid."""
+
+    def __init__(self, grid):
+        self.g = grid
+        self.lo = np.full((grid.width, grid.height), grid.l0)
+        self.t = grid.updated_at
+
+    def decay(self, now):
+        if self.g.half_life_s is not None and now > self.t:
+            self.lo = self.g.l0 + (self.lo - self.g.l0) * 0.5 ** ((now - self.t) / self.g.half_life_s)
+            self.t = now
+
+    def update(self, xs, ys, ps, now):
+        g = self.g
+        self.decay(now)
+        xs, ys = np.asarray(xs, float), np.asarray(ys, float)
+        ev = _logit(np.asarray(ps, float)) - g.l0
+        X, Y = np.meshgrid(np.arange(g.width), np.arange(g.height), indexing="ij")
+        for x, y, e in zip(xs, ys, ev):
+            cx, cy = np.rint(x), np.rint(y)
+            near = (np.abs(X - cx) <= np.ceil(3 * g.sigma)) & (np.abs(Y - cy) <= np.ceil(3 * g.sigma))
+            w = np.exp(-((X - x) ** 2 + (Y - y) ** 2) / (2 * g.sigma ** 2))
+            self.lo += np.where(near, w * e, 0.0)
+        np.clip(self.lo, -g.clamp, g.clamp, out=self.lo)
+
+    def probability(self, now):
+        self.decay(now)
+        return 1.0 / (1.0 + np.exp(-self.lo))
+
+
+def run_both(half_life_s, steps=200, seed=0):
+    rng = np.random.default_rng(seed)
+    grid = RiskGrid(30, 20, sigma=1.0, half_life_s=half_life_s, clamp=6.0)
+    eager = EagerGrid(grid)
+    t = grid.updated_at
+    for _ in range(steps):
+        t += rng.uniform(0, 20)
+        n = rng.integers(1, 6)
+        xs, ys, ps = rng.uniform(-2, 32, n), rng.uniform(-2, 22, n), rng.uniform(0, 1, n)
+        grid.update(xs, ys, ps, now=t)
+        eager.update(xs, ys, ps, now=t)
+    return grid, eager, t
+
+
+@pytest.mark.parametrize("half_life_s", [600.0, 30.0, 2.0, None])
+def test_lazy_decay_matches_eager_decay(half_life_s):
+    # 2 s half-life with ~10 s steps rebases many times along the way
+    grid, eager, t = run_both(half_life_s)
+    for later in (t, t + 15.0, t + 600.0):
+        np.testing.assert_allclose(grid.probability(later), eager.probability(later), atol=1e-5)
+
+
+def test_rebase_keeps_dev_bounded():
+    grid = RiskGrid(10, 10, half_life_s=1.0)
+    t = grid.updated_at
+    for _ in range(50):
+        t += 3.0
+        grid.update([5], [5], [0.99], now=t)
+    assert grid.ref_t > grid.updated_at - 20.0  # rebased recently
+    assert grid._scale(t) >= REBASE_SCALE
+    assert np.isfinite(grid.dev).all() and np.abs(grid.dev).max() < 1e5
+
+
+def test_clamp_caps_repeated_evidence():
+    grid = RiskGrid(10, 10, sigma=0.0, half_life_s=60.0, clamp=4.0)
+    t = grid.updated_at
+    for i in range(100):
+        grid.update([3], [3], [0.999], now=t + i)
+    p = grid.probability(t + 99)
+    assert p[3, 3] == pytest.approx(1 / (1 + np.exp(-4.0)), rel=1e-5)
+    # cells outside the (single-cell) footprint still sit at the prior
+    assert p[0, 0] == pytest.approx(grid.prior, rel=1e-5)
+    # and the capped cell relaxes back towards the prior
+    assert grid.probability(t + 99 + 3600)[3, 3] == pytest.approx(grid.prior, rel=1e-3)
+
+
+def test_clock_never_runs_backwards():
+    grid = RiskGrid(10, 10, half_life_s=10.0)
+    t = grid.updated_at
+    grid.update([5], [5], [0.9], now=t + 100)
+    before = grid.probability(t + 100)
+    np.testing.assert_array_equal(grid.probability(t), before)
+
+
+def test_save_load_round_trip(tmp_path):
+    grid, _, t = run_both(30.0, steps=50)
+    path = tmp_path / "m.npz"
+    grid.save(path)
+    loaded = RiskGrid.load(path)
+    assert loaded.n_readings == grid.n_readings
+    np.testing.assert_allclose(loaded.probability(t + 10), grid.probability(t + 10), atol=1e-6)
+
+
+@pytest.mark.parametrize("xs,ys,ps", [([np.nan], [1], [0.5]), ([1], [np.inf], [0.5]), ([1], [1], [np.nan]),
+                                      ([1, 2], [1], [0.5])])
+def test_bad_readings_are_rejected(xs, ys, ps):
+    grid = RiskGrid(10, 10)
+    with pytest.raises(ValueError):
+        grid.update(xs, ys, ps)
+    assert np.isfinite(grid.probability()).all()
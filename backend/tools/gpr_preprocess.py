@@ -1,28 +1,63 @@
 # gpr_preprocess.py
+import io
+import mmap
 import os
 import zipfile
 import numpy as np
 import matplotlib.pyplot as plt
 from scipy.fft import rfft, rfftfreq
 from scipy.io import loadmat
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 import sys
 import json
 from scipy.signal import detrend, butter, filtfilt
 
+# shared tiling code: backend/gpr_tiles.py (NumPy only, does not import the app package)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from gpr_tiles import build_tile_pyramid
+
 ZIP_PATH = "../datasets/archive.zip"  
 
 OUT_DIR = Path("gpr_outputs")
 OUT_DIR.mkdir(exist_ok=True)
 
-def try_load_file(fp):
-    ext = fp.suffix.lower()
+SUPPORTED_EXTS = (".npy", ".csv", ".mat", ".txt")
+
+def _npy_from_member(z, info, zip_map):
+    """Read a .npy member without extracting it; stored members are viewed in place."""
+    with z.open(info) as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+        if dtype.hasobject:
+            raise ValueError("object arrays are not supported")
+        header_len = f.tell()
+        if info.compress_type == zipfile.ZIP_STORED and zip_map is not None:
+            # local file header: 30 fixed bytes + filename + extra field
+            lh = info.header_offset
+            name_len = int.from_bytes(zip_map[lh + 26:lh + 28], "little")
+            extra_len = int.from_bytes(zip_map[lh + 28:lh + 30], "little")
+            start = lh + 30 + name_len + extra_len + header_len
+            buf = memoryview(zip_map)[start:start + info.file_size - header_len]
+        else:
+            buf = f.read()
+    count = int(np.prod(shape)) if shape else 1
+    arr = np.frombuffer(buf, dtype=dtype, count=count)
+    return arr.reshape(shape, order="F" if fortran else "C")
+
+def try_load_member(z, info, zip_map=None):
+    ext = PurePosixPath(info.filename).suffix.lower()
     if ext == ".npy":
-        return np.load(fp)
+        return _npy_from_member(z, info, zip_map)
     if ext == ".csv" or ext == ".txt":
-        return np.loadtxt(fp, delimiter=",")
+        with z.open(info) as f:
+            return np.loadtxt(io.TextIOWrapper(f, encoding="utf-8"), delimiter=",")
     if ext == ".mat":
-        d = loadmat(fp)
+        # loadmat seeks around the file, which is slow on a deflate stream
+        with z.open(info) as f:
+            d = loadmat(io.BytesIO(f.read()))
         # heuristics: pick the largest 2D array
         arrays = [v for v in d.values() if isinstance(v, np.ndarray) and v.ndim == 2]
         if len(arrays) > 0:
@@ -30,26 +65,38 @@ def try_load_file(fp):
         raise ValueError("No 2D array found in .mat")
     raise ValueError(f"Unsupported file type: {ext}")
 
+def find_bscan(zip_path):
+    """Return (member name, 2D array) of the first usable B-scan in the archive."""
+    with open(zip_path, "rb") as fh, zipfile.ZipFile(fh) as z:
+        try:
+            zip_map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            zip_map = None
+        for info in z.infolist():
+            if info.is_dir() or PurePosixPath(info.filename).suffix.lower() not in SUPPORTED_EXTS:
+                continue
+            try:
+                arr = try_load_member(z, info, zip_map)
+            except Exception as e:
+                print("skip", info.filename, e)
+                continue
+            if arr.ndim == 2 and arr.size > 100:
+                # a stored .npy stays a read-only view into the mapping,
+                # which is kept alive by the array itself
+                return info.filename, arr
+            # a rejected view would otherwise pin the mapping and make close() raise BufferError
+            del arr
+        if zip_map is not None:
+            zip_map.close()
+    return None
+
 def bandpass(data, fs=1.0, low=50, high=1000, order=4):
     ny = 0.5 * fs
     b, a = butter(order, [low/ny, high/ny], btype="band")
     return filtfilt(b, a, data, axis=-1)
 
-with zipfile.ZipFile(ZIP_PATH, 'r') as z:
-    z.extractall("tmp_gpr")
-
-# search for candidate files
-candidates = list(Path("tmp_gpr").rglob("*"))
-loaded = None
-for f in candidates:
-    if f.suffix.lower() in (".npy", ".csv", ".mat", ".txt"):
-        try:
-            arr = try_load_file(f)
-            if arr.ndim == 2 and arr.size > 100:
-                loaded = (f, arr)
-                break
-        except Exception as e:
-            print("skip", f, e)
+# stream candidate members straight out of the archive (no extraction)
+loaded = find_bscan(ZIP_PATH)
 
 if not loaded:
     print("No suitable 2D GPR file found in archive.")
@@ -74,6 +121,10 @@ data = detrend(data, axis=1)  # remove linear trend along depth axis per trace
 vmin, vmax = np.percentile(data, [1, 99])
 vis = np.clip((data - vmin) / (vmax - vmin), 0, 1)
 
+# Tile pyramid for the frontend viewer (zoom/x/y tiles served by /api/gpr/tiles)
+tile_meta = build_tile_pyramid(data, OUT_DIR / "heatmap.tiles")
+print("Tile pyramid zoom levels:", tile_meta["max_zoom"] + 1)
+
 # Heatmap
 plt.figure(figsize=(10,6))
 plt.imshow(vis.T, aspect='auto', cmap='turbo', origin='lower')
@@ -113,6 +164,7 @@ meta = {
     "shape": data.shape,
     "vmin": float(vmin),
     "vmax": float(vmax),
+    "tiles": "heatmap.tiles",
 }
 with open(OUT_DIR / "meta.json", "w") as f:
     json.dump(meta, f, indent=2)
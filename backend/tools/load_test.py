@@ -0,0 +1,360 @@
+# load_test.py
+"""
+Local load generator for the IntelliMine API.
+
+Boots create_app() in-process on a threaded WSGI server with an in-memory
+stand-in for MongoDB (mongomock if installed, else the minimal MemoryDatabase
+below), registers a pool of users, then drives a weighted mix of auth,
+prediction, frame-ingest and path-planning requests at a fixed request rate
+with N concurrent clients. Sensor bodies are replayed from the training
+datasets; a JSON/JSONL file of recorded requests can be replayed instead.
+
+    python tools/load_test.py --rps 50 --concurrency 8 --duration 30
+    python tools/load_test.py --rps 0 --concurrency 4            # closed loop, max throughput
+    python tools/load_test.py --mix predict_mine=5,path=5 --url http://127.0.0.1:8000
+
+Replay records look like {"method": "POST", "path": "/api/predict/mine", "json": {...}}.
+In open-loop mode latency is measured from each request's scheduled start
+to its full response, so time spent waiting for a free client shows up in the
+percentiles (no coordinated omission); requests that started more than 10 ms
+behind schedule are also counted as late. Closed-loop latency is send to
+response.
+"""
+import argparse
+import csv
+import http.client
+import itertools
+import json
+import logging
+import os
+import random
+import secrets
+import sys
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.utils.frames import FRAME_MAGIC, HEADER, VERSION  # noqa: E402
+from app.utils.features import RAW_CHANNELS, derive_features  # noqa: E402
+
+DEFAULT_MIX = "predict_mine=7,predict_mine_raw=3,predict_mine_type=3,ingest_frames=1,path=3,path_coverage=1,login=1,me=2"
+N_USERS = 20
+GRID_W, GRID_H = 40, 30
+
+
+# --- in-memory Mongo stand-in ---
+
+def _matches(doc, query):
+    for key, cond in query.items():
+        if key == "$or":
+            if not any(_matches(doc, q) for q in cond):
+                return False
+        elif key == "$and":
+            if not all(_matches(doc, q) for q in cond):
+                return False
+        elif doc.get(key) != cond:
+            return False
+    return True
+
+
+class MemoryCollection:
+    """The subset of pymongo.Collection the app uses: find_one / insert_one with equality queries."""
+
+    def __init__(self):
+        self.docs = []
+        self.lock = threading.Lock()
+
+    def find_one(self, query=None):
+        with self.lock:
+            for doc in self.docs:
+                if _matches(doc, query or {}):
+                    return dict(doc)
+        return None
+
+    def insert_one(self, doc):
+        from bson import ObjectId
+        doc.setdefault("_id", ObjectId())
+        with self.lock:
+            self.docs.append(dict(doc))
+        return doc["_id"]
+
+
+class MemoryDatabase:
+    def __init__(self):
+        self.collections = defaultdict(MemoryCollection)
+
+    def __getattr__(self, name):
+        if name.startswith("_") or name == "collections":
+            raise AttributeError(name)
+        return self.collections[name]
+
+    __getitem__ = __getattr__
+
+
+def memory_database():
+    try:
+        import mongomock
+        return mongomock.MongoClient().db
+    except ImportError:
+        return MemoryDatabase()
+
+
+def boot_app(app_logs=False):
+    """create_app() on a local threaded server backed by an in-memory database; returns (base_url, server)."""
+    os.environ.setdefault("WARMUP_MODE", "eager")
+    os.environ.setdefault("JWT_SECRET_KEY", secrets.token_hex(32))
+    os.chdir(BACKEND_DIR)
+    from werkzeug.serving import make_server
+    from app import create_app, mongo
+    import app.routes.predict_routes  # noqa: F401  (sets up the app's file logging)
+
+    if not app_logs:
+        # keep the load run out of mine_detector.log / the console
+        logging.getLogger().handlers.clear()
+        logging.getLogger().addHandler(logging.NullHandler())
+        logging.getLogger("werkzeug").setLevel(logging.ERROR)
+
+    app = create_app()
+    mongo.db = memory_database()
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, name="wsgi-server", daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}", server
+
+
+# --- traffic ---
+
+def _read_rows(path, columns):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return np.array([[float(row[c]) for c in columns] for row in csv.DictReader(f)])
+
+
+class Traffic:
+    """Request factories keyed by endpoint name; each returns (method, path, body, headers)."""
+
+    def __init__(self, users, seed=0):
+        models = BACKEND_DIR / "app" / "models"
+        raw = _read_rows(models / "mine_detection_dataset.csv", RAW_CHANNELS)
+        self.sensor_rows = derive_features(raw).astype(np.float32)
+        self.type_rows = _read_rows(models / "mine_dataset.csv", ["V", "H", "S"])
+        self.users = users
+        self.rng = random.Random(seed)
+        self.factories = {
+            "predict_mine": self.predict_mine,
+            "predict_mine_raw": self.predict_mine_raw,
+            "predict_mine_type": self.predict_mine_type,
+            "ingest_frames": self.ingest_frames,
+            "path": self.path,
+            "path_coverage": self.path_coverage,
+            "login": self.login,
+            "me": self.me,
+        }
+
+    def predict_mine(self):
+        row = self.sensor_rows[self.rng.randrange(len(self.sensor_rows))]
+        return "POST", "/api/predict/mine", {"input": [round(float(v), 6) for v in row]}, {}
+
+    def predict_mine_raw(self):
+        row = self.sensor_rows[self.rng.randrange(len(self.sensor_rows)), :len(RAW_CHANNELS)]
+        return "POST", "/api/predict/mine", {"input": [round(float(v), 6) for v in row]}, {}
+
+    def predict_mine_type(self):
+        V, H, S = self.type_rows[self.rng.randrange(len(self.type_rows))]
+        return "POST", "/api/predict/mine-type", {"V": float(V), "H": float(H), "S": int(S)}, {}
+
+    def ingest_frames(self, rows=256):
+        start = self.rng.randrange(max(1, len(self.sensor_rows) - rows))
+        X = self.sensor_rows[start:start + rows]
+        body = HEADER.pack(FRAME_MAGIC, VERSION, 0, X.shape[1], len(X)) + X.astype("<f4").tobytes()
+        return "POST", "/api/ingest/frames", body, {"Content-Type": "application/octet-stream"}
+
+    def _cell(self):
+        return [self.rng.randrange(GRID_W), self.rng.randrange(GRID_H)]
+
+    def path(self):
+        return "POST", "/api/path/generate", {"start": self._cell(), "goal": self._cell(), "compact": True}, {}
+
+    def path_coverage(self):
+        return "POST", "/api/path/generate", {"start": self._cell(), "mode": "coverage", "compact": True}, {}
+
+    def login(self):
+        user = self.rng.choice(self.users)
+        return "POST", "/api/auth/login", {"email": user["email"], "password": user["password"]}, {}
+
+    def me(self):
+        user = self.rng.choice(self.users)
+        return "GET", "/api/auth/me", None, {"Authorization": f"Bearer {user['token']}"}
+
+
+def load_replay(path):
+    text = Path(path).read_text().strip()
+    if not text:
+        return []
+    records = json.loads(text) if text.startswith("[") else [json.loads(l) for l in text.splitlines() if l.strip()]
+    return [(r.get("method", "POST"), r["path"], r.get("json"), r.get("headers", {})) for r in records]
+
+
+def parse_mix(spec, known):
+    weights = {}
+    for part in spec.split(","):
+        name, _, w = part.partition("=")
+        if name not in known:
+            raise SystemExit(f"Unknown endpoint '{name}' in --mix; choose from {sorted(known)}")
+        weights[name] = float(w or 1)
+    return weights
+
+
+# --- client ---
+
+def send(base_url, method, path, body, headers, timeout=60):
+    url = urlsplit(base_url)
+    conn = http.client.HTTPConnection(url.hostname, url.port, timeout=timeout)
+    try:
+        if body is not None and not isinstance(body, bytes):
+            body = json.dumps(body).encode()
+            headers = {"Content-Type": "application/json", **headers}
+        conn.request(method, path, body=body, headers=headers)
+        resp = conn.getresponse()
+        data = resp.read()
+        return resp.status, data
+    finally:
+        conn.close()
+
+
+def setup_users(base_url, n=N_USERS):
+    users = []
+    run = int(time.time())
+    for i in range(n):
+        user = {"email": f"load{run}_{i}@example.com", "password": f"pw-{i}-load"}
+        send(base_url, "POST", "/api/auth/register",
+             {"username": f"load{run}_{i}", **user}, {})
+        status, data = send(base_url, "POST", "/api/auth/login", user, {})
+        if status != 200:
+            raise SystemExit(f"Login for load-test user failed ({status}): {data[:200]!r}")
+        user["token"] = json.loads(data)["token"]
+        users.append(user)
+    return users
+
+
+def run_load(base_url, pick, rps, concurrency, duration):
+    """Open-loop at `rps` (closed loop when rps <= 0); returns {endpoint: [(latency_s, status)]}, late, elapsed."""
+    results = defaultdict(list)
+    late = [0]
+    lock = threading.Lock()
+    ticket = itertools.count()
+    t0 = time.perf_counter() + 0.05
+    stop = t0 + duration
+
+    def client():
+        while True:
+            k = next(ticket)
+            due = None
+            if rps > 0:
+                due = t0 + k / rps
+                if due >= stop:
+                    return
+                wait = due - time.perf_counter()
+                if wait > 0:
+                    time.sleep(wait)
+                elif wait < -0.01:
+                    with lock:
+                        late[0] += 1
+            elif time.perf_counter() >= stop:
+                return
+            with lock:
+                name, (method, path, body, headers) = pick()
+            t = due if due is not None else time.perf_counter()
+            try:
+                status, _ = send(base_url, method, path, body, headers)
+            except OSError:
+                status = 0
+            latency = time.perf_counter() - t
+            with lock:
+                results[name].append((latency, status))
+
+    threads = [threading.Thread(target=client, daemon=True) for _ in range(concurrency)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    return results, late[0], max(time.perf_counter(), stop) - t0
+
+
+def summarize(results, elapsed):
+    report = {}
+    for name in sorted(results):
+        lat = np.array([r[0] for r in results[name]]) * 1000.0
+        status = np.array([r[1] for r in results[name]])
+        p50, p95, p99 = np.percentile(lat, [50, 95, 99])
+        report[name] = {
+            "requests": int(len(lat)),
+            "errors": int(((status == 0) | (status >= 500)).sum()),
+            "throughput_rps": round(len(lat) / elapsed, 2),
+            "p50_ms": round(float(p50), 2),
+            "p95_ms": round(float(p95), 2),
+            "p99_ms": round(float(p99), 2),
+            "max_ms": round(float(lat.max()), 2),
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="target an already running server instead of booting one in-process")
+    parser.add_argument("--rps", type=float, default=20.0, help="target requests/second (0 = closed loop)")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="endpoint=weight,... (ignored with --replay)")
+    parser.add_argument("--replay", help="JSON array or JSONL of recorded requests")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the report to this file")
+    parser.add_argument("--app-logs", action="store_true", help="keep the app's own request logging")
+    args = parser.parse_args()
+
+    base_url = args.url.rstrip("/") if args.url else boot_app(args.app_logs)[0]
+    print(f"Target {base_url}")
+
+    rng = random.Random(args.seed)
+    if args.replay:
+        records = load_replay(args.replay)
+        if not records:
+            raise SystemExit(f"No requests in {args.replay}")
+        cycle = itertools.cycle(records)
+
+        def pick():
+            record = next(cycle)
+            return f"{record[0]} {record[1]}", record
+    else:
+        traffic = Traffic(setup_users(base_url), seed=args.seed)
+        weights = parse_mix(args.mix, traffic.factories)
+        names, w = list(weights), list(weights.values())
+
+        def pick():
+            name = rng.choices(names, w)[0]
+            return name, traffic.factories[name]()
+
+    results, late, elapsed = run_load(base_url, pick, args.rps, args.concurrency, args.duration)
+    report = summarize(results, elapsed)
+    total = sum(r["requests"] for r in report.values())
+
+    print(f"\n{'endpoint':<26}{'reqs':>7}{'err':>6}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, r in report.items():
+        print(f"{name:<26}{r['requests']:>7}{r['errors']:>6}{r['throughput_rps']:>9.1f}"
+              f"{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}{r['max_ms']:>10.1f}")
+    print(f"\n{total} requests in {elapsed:.1f}s = {total / elapsed:.1f} req/s "
+          f"(target {args.rps or 'max'}, concurrency {args.concurrency}, {late} started late)")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"rps": args.rps, "concurrency": args.concurrency, "duration_s": round(elapsed, 2),
+                       "late_starts": late, "endpoints": report}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
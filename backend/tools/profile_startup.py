@@ -0,0 +1,71 @@
+# profile_startup.py
+"""
+Cold-start report: boots create_app() in a fresh interpreter with
+`python -X importtime` and eager warm-up, then prints where the time went,
+split into top-level package imports and the model load / warm-up stages.
+
+    python tools/profile_startup.py [--top 15]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+CHILD = (
+    "import json, time\n"
+    "t0 = time.perf_counter()\n"
+    "from app import create_app\n"
+    "from app.utils.startup import profile\n"
+    "create_app()\n"
+    "report = profile.report()\n"
+    "report['boot_ms'] = round((time.perf_counter() - t0) * 1000.0, 1)\n"
+    "print('@@REPORT@@' + json.dumps(report))\n"
+)
+
+
+def parse_importtime(stderr):
+    """Cumulative microseconds per top-level package, counted at its outermost import."""
+    per_pkg = defaultdict(int)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time:   self_us |   cumulative_us |   <indent>module"
+        _self_us, cum_us, name = line[len("import time:"):].split("|")
+        # nesting depth is the indentation after the single separating space
+        if not name[1:].startswith(" "):
+            per_pkg[name.strip().split(".")[0]] += int(cum_us)
+    return per_pkg
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=15, help="number of packages to list")
+    args = parser.parse_args()
+
+    env = {**os.environ, "WARMUP_MODE": "eager"}
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", CHILD],
+                          cwd=BACKEND_DIR, env=env, capture_output=True, text=True)
+    report_line = next((l for l in proc.stdout.splitlines() if l.startswith("@@REPORT@@")), None)
+    if proc.returncode != 0 or report_line is None:
+        sys.stderr.write(proc.stderr[-4000:])
+        sys.exit("❌ App failed to boot")
+    report = json.loads(report_line[len("@@REPORT@@"):])
+
+    per_pkg = sorted(parse_importtime(proc.stderr).items(), key=lambda kv: kv[1], reverse=True)
+    print(f"Boot to ready: {report['boot_ms']:.0f} ms (includes -X importtime overhead)\n")
+    print(f"{'package':<28}{'import ms':>12}")
+    for pkg, us in per_pkg[:args.top]:
+        print(f"{pkg:<28}{us / 1000.0:>12.1f}")
+
+    print(f"\n{'stage':<28}{'ms':>12}  thread")
+    for s in report["stages"]:
+        print(f"{s['stage']:<28}{s['ms']:>12.1f}  {s['thread']}")
+
+
+if __name__ == "__main__":
+    main()